@@ -1,3 +1,10 @@
-from .main import app
-
 __all__ = ['app']
+
+
+def __getattr__(name: str):
+    # `app.main` se carga solo al pedir `app.app`: los CLIs (migraciones, worker) no importan routers ni middlewares
+    if name == 'app':
+        from .main import app
+
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -12,8 +12,55 @@ class Settings(BaseSettings):
     admin_email: str = 'admin@pixelnostalgia.mx'
     admin_password: str = 'change-me-now'
     default_currency: str = 'USD'
+    supported_currencies: str = 'USD,MXN,EUR,COP'
     exchange_api_base: str = 'https://api.exchangerate.host'
     media_root: str = 'media'
+    media_quota_bytes: int = 200 * 1024 * 1024
+    host: str = '0.0.0.0'
+    port: int = 8000
+    web_concurrency: int = 0
+    graceful_timeout_seconds: int = 30
+    drain_delay_seconds: float = 5
+    # proxies cuyos X-Forwarded-For se aceptan (loopback y redes de Docker Compose)
+    forwarded_allow_ips: str = '127.0.0.1,::1,172.16.0.0/12'
+    skip_startup_tasks: bool = False
+    startup_profile: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    migration_lock_timeout: str = '5s'
+    warmup_enabled: bool = True
+    warmup_concurrency: int = 4
+    warmup_timeout_seconds: float = 15
+    rate_limit_enabled: bool = True
+    rate_limit_login: str = 'ip:30/60,user:5/60'
+    rate_limit_upload: str = 'ip:60/60,user:20/60'
+    rate_limit_checkout: str = 'ip:60/60,user:10/60'
+    max_in_flight_login: int = 16
+    max_in_flight_upload: int = 8
+    max_in_flight_checkout: int = 32
+    analytics_refresh_seconds: int = 300
+    outbox_worker_enabled: bool = True
+    outbox_batch_size: int = 100
+    outbox_poll_seconds: float = 2
+    outbox_max_attempts: int = 8
+    outbox_base_backoff_seconds: float = 2
+    outbox_max_backoff_seconds: float = 600
+    maintenance_interval_seconds: int = 3600
+    maintenance_batch_size: int = 500
+    maintenance_max_batches: int = 20
+    cart_item_ttl_days: int = 30
+    declined_offer_ttl_days: int = 30
+    sold_camera_archive_days: int = 30
+    orphan_media_grace_hours: int = 24
+    outbox_retention_days: int = 7
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 5
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+
+    @property
+    def supported_currency_list(self) -> list[str]:
+        return [code.strip().upper() for code in self.supported_currencies.split(',') if code.strip()]
 
     class Config:
         env_file = '.env'
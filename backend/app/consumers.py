@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from pathlib import Path
+
+from sqlalchemy import update
+
+from .database import async_session_factory
+from .models import MediaAsset
+from .outbox import CAMERA_CHANGED, MEDIA_UPLOADED, handler
+from .services.catalog import invalidate_camera_changes
+from .storage import INCOMING_DIR, MEDIA_ROOT
+from .utils.images import image_dimensions
+
+
+@handler(CAMERA_CHANGED)
+async def invalidate_camera_caches(payload: dict) -> None:
+    await invalidate_camera_changes(uuid.UUID(value) for value in payload.get('camera_ids', []))
+
+
+def _read_dimensions(path: Path) -> tuple[int, int] | None:
+    return image_dimensions(path.read_bytes())
+
+
+@handler(MEDIA_UPLOADED)
+async def process_uploaded_media(payload: dict) -> None:
+    # tamaño y hash se registran al subir; aquí solo se completan las dimensiones en media_assets
+    dimensions: dict[str, tuple[int, int]] = {}
+    for public_path in payload.get('paths', []):
+        file_path = (MEDIA_ROOT / public_path.removeprefix('/uploads/')).resolve()
+        if MEDIA_ROOT not in file_path.parents:
+            continue
+        if not file_path.is_file():
+            # la subida confirma la fila antes de mover el archivo desde INCOMING_DIR
+            file_path = INCOMING_DIR / file_path.name
+            if not file_path.is_file():
+                continue
+        found = await asyncio.to_thread(_read_dimensions, file_path)
+        if found:
+            dimensions[public_path] = found
+    if not dimensions:
+        return
+    async with async_session_factory() as session:
+        for public_path, (width, height) in dimensions.items():
+            await session.execute(
+                update(MediaAsset).where(MediaAsset.path == public_path).values(width=width, height=height)
+            )
+        await session.commit()
@@ -12,7 +12,13 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(settings.database_url, echo=False, future=True)
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    future=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+)
 async_session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -20,9 +26,3 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         yield session
 
-
-async def init_models() -> None:
-    from . import models  # noqa: F401 - ensures models are registered
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
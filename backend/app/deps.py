@@ -1,18 +1,16 @@
 from __future__ import annotations
 
-import json
+import uuid
 
 from fastapi import Depends, Header, HTTPException, status
-import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .config import get_settings
 from .database import get_session
 from .models import User
 from .redis_client import get_session_store
+from .sessions import resolve_session
 
-settings = get_settings()
 SESSION_HEADER = 'X-Session-Token'
 
 
@@ -26,32 +24,23 @@ async def session_token(x_session_token: str | None = Header(default=None)) -> s
     return x_session_token
 
 
+def user_statement(user_id: uuid.UUID):
+    return select(User).where(User.id == user_id)
+
+
 async def get_current_user(
     token: str = Depends(session_token),
     session: AsyncSession = Depends(get_session),
     store=Depends(get_session_store),
 ) -> User:
-    cache_key = f'session:{token}'
-    payload = await store.get(cache_key)
-    if not payload:
-        raise _unauthorized()
-
-    session_data = json.loads(payload)
-    user_id = session_data.get('user_id')
+    user_id = await resolve_session(store, token)
     if not user_id:
         raise _unauthorized()
 
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError as exc:  # pragma: no cover - guard rail
-        raise _unauthorized() from exc
-
-    result = await session.execute(select(User).where(User.id == user_uuid))
+    result = await session.execute(user_statement(user_id))
     user = result.scalar_one_or_none()
     if not user:
         raise _unauthorized()
-
-    await store.expire(cache_key, settings.session_ttl_seconds)
     return user
 
 
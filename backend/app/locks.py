@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+
+from .database import engine
+
+# claves de pg_advisory_lock compartidas por todos los procesos y réplicas
+STARTUP_LOCK_KEY = 7_310_001
+ANALYTICS_REFRESH_LOCK_KEY = 7_310_002
+MIGRATIONS_LOCK_KEY = 7_310_003
+MAINTENANCE_LOCK_KEY = 7_310_004
+
+
+@asynccontextmanager
+async def advisory_lock(key: int) -> AsyncIterator[None]:
+    async with engine.connect() as conn:
+        await conn.execute(text('SELECT pg_advisory_lock(:key)'), {'key': key})
+        try:
+            yield
+        finally:
+            await conn.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': key})
+
+
+@asynccontextmanager
+async def try_advisory_lock(key: int) -> AsyncIterator[bool]:
+    async with engine.connect() as conn:
+        result = await conn.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': key})
+        acquired = bool(result.scalar())
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': key})
@@ -1,30 +1,84 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
-from pathlib import Path
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from .config import get_settings
-from .database import init_models
+from .database import engine
+from .locks import ANALYTICS_REFRESH_LOCK_KEY, MAINTENANCE_LOCK_KEY
+from .maintenance import run_maintenance
+from .middleware import CompressionMiddleware, ConditionalGetMiddleware
+from .profiling import deferred_modules_loaded, startup_profile
+from .readiness import install_drain_handler, readiness
 from .redis_client import close_redis
-from .routers import auth, cameras, cart, currency, media, offers
-from .startup import ensure_admin_user
+from .routers import analytics, auth, cameras, cart, currency, health, media, offers
+from .services.analytics import REFRESH_TASK, refresh_views
+from .services.exchange import close_http_client
+from .startup import run_startup_tasks
+from .storage import MEDIA_ROOT, ensure_media_dirs
+from .tasks import run_periodic
+from .warmup import warm_up
+from .worker import run_worker
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
-BASE_DIR = Path(__file__).resolve().parent.parent
-MEDIA_ROOT = (BASE_DIR / settings.media_root).resolve()
-MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    await init_models()
-    await ensure_admin_user()
+    with startup_profile.phase('media_dirs'):
+        ensure_media_dirs()
+    if not settings.skip_startup_tasks:
+        with startup_profile.phase('startup_tasks'):
+            await run_startup_tasks()
+    readiness.startup_complete = True
+    install_drain_handler(settings.drain_delay_seconds)
+    # el calentamiento corre en segundo plano: liveness responde de inmediato y readiness espera a que termine
+    background: list[asyncio.Task] = []
+    if settings.warmup_enabled:
+        background.append(asyncio.create_task(warm_up()))
+    else:
+        readiness.finish_warmup()
+    if settings.analytics_refresh_seconds > 0:
+        background.append(
+            asyncio.create_task(
+                run_periodic(
+                    REFRESH_TASK, settings.analytics_refresh_seconds, refresh_views, ANALYTICS_REFRESH_LOCK_KEY
+                )
+            )
+        )
+    if settings.maintenance_interval_seconds > 0:
+        background.append(
+            asyncio.create_task(
+                run_periodic(
+                    'maintenance', settings.maintenance_interval_seconds, run_maintenance, MAINTENANCE_LOCK_KEY
+                )
+            )
+        )
+    if settings.outbox_worker_enabled:
+        background.append(asyncio.create_task(run_worker()))
+    if settings.startup_profile:
+        logger.info(
+            'Perfil de arranque (ms): %s; módulos diferidos ya cargados: %s',
+            startup_profile.as_dict(),
+            deferred_modules_loaded() or '-',
+        )
     yield
+    readiness.draining = True
+    for task in background:
+        task.cancel()
+    for task in background:
+        with suppress(asyncio.CancelledError):
+            await task
+    await close_http_client()
     await close_redis()
+    await engine.dispose()
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
@@ -36,8 +90,18 @@ app.add_middleware(
     allow_methods=['*'],
     allow_headers=['*'],
 )
+app.add_middleware(ConditionalGetMiddleware, excluded_prefixes=('/uploads',))
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+    zstd_level=settings.compression_zstd_level,
+    excluded_prefixes=('/uploads',),
+)
 
-app.mount('/uploads', StaticFiles(directory=str(MEDIA_ROOT)), name='uploads')
+# el directorio se crea en el lifespan; StaticFiles no lo verifica al importar
+app.mount('/uploads', StaticFiles(directory=str(MEDIA_ROOT), check_dir=False), name='uploads')
 
 app.include_router(auth.router)
 app.include_router(cameras.router)
@@ -45,6 +109,8 @@ app.include_router(offers.router)
 app.include_router(cart.router)
 app.include_router(currency.router)
 app.include_router(media.router)
+app.include_router(analytics.router)
+app.include_router(health.router)
 
 
 @app.get('/')
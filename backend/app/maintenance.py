@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import get_settings
+from .database import async_session_factory, engine
+from .locks import MAINTENANCE_LOCK_KEY, advisory_lock
+from .models import Camera, CartItem, MediaAsset, Offer, OutboxEvent
+from .outbox import CAMERA_CHANGED, enqueue, notify
+from .redis_client import close_redis
+from .services import cart_summary
+from .services.media import find_orphans
+from .storage import CAMERA_UPLOAD_DIR, INCOMING_DIR, MEDIA_ROOT
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Cada lote es una transacción corta: SELECT ... LIMIT ... FOR UPDATE SKIP LOCKED seguido del DELETE/UPDATE,
+# así el mantenimiento nunca retiene locks largos ni compite con las peticiones por las mismas filas.
+
+
+Step = Callable[[AsyncSession, int], Awaitable[list]]
+AfterCommit = Callable[[list], Awaitable[None]]
+
+
+async def _in_batches(step: Step, after_commit: AfterCommit | None = None) -> int:
+    # único punto de commit; los efectos fuera de Postgres (Redis) corren solo con el lote ya confirmado
+    total = 0
+    for _ in range(settings.maintenance_max_batches):
+        async with async_session_factory() as session:
+            affected = await step(session, settings.maintenance_batch_size)
+            await session.commit()
+        if after_commit and affected:
+            await after_commit(affected)
+        total += len(affected)
+        if len(affected) < settings.maintenance_batch_size:
+            break
+    return total
+
+
+async def expire_cart_items(session: AsyncSession, limit: int) -> list:
+    cutoff = datetime.utcnow() - timedelta(days=settings.cart_item_ttl_days)
+    stale = (
+        select(CartItem.id)
+        .where(CartItem.created_at < cutoff)
+        .order_by(CartItem.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(
+        delete(CartItem)
+        .where(CartItem.id.in_(stale.scalar_subquery()))
+        .returning(CartItem.user_id, CartItem.camera_id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.all()
+
+
+async def forget_cart_items(removed: list) -> None:
+    for user_id, camera_id in removed:
+        await cart_summary.record_item_removed(user_id, camera_id)
+
+
+async def archive_sold_cameras(session: AsyncSession, limit: int) -> list:
+    cutoff = datetime.utcnow() - timedelta(days=settings.sold_camera_archive_days)
+    candidates = (
+        select(Camera.id)
+        .where(Camera.sold_at < cutoff, Camera.archived_at.is_(None))
+        .order_by(Camera.sold_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    # updated_at se conserva (archivar no es una edición del anuncio), pero version sube: cambia el ETag
+    result = await session.execute(
+        update(Camera)
+        .where(Camera.id.in_(candidates.scalar_subquery()))
+        .values(archived_at=datetime.utcnow(), updated_at=Camera.updated_at, version=Camera.version + 1)
+        .returning(Camera.id)
+        .execution_options(synchronize_session=False)
+    )
+    archived = list(result.scalars())
+    if archived:
+        enqueue(session, CAMERA_CHANGED, {'camera_ids': [str(camera_id) for camera_id in archived]})
+    return archived
+
+
+async def archive_declined_offers(session: AsyncSession, limit: int) -> list:
+    cutoff = datetime.utcnow() - timedelta(days=settings.declined_offer_ttl_days)
+    candidates = (
+        select(Offer.id)
+        # literal y no parámetro: así el plan genérico también puede usar el índice parcial
+        # offers_declined_live_idx
+        .where(
+            Offer.status == literal_column("'declined'"),
+            Offer.archived_at.is_(None),
+            Offer.updated_at < cutoff,
+        )
+        .order_by(Offer.updated_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    # la fila queda para la analítica; sus fotos se desvinculan y las borra delete_orphan_media
+    result = await session.execute(
+        update(Offer)
+        .where(Offer.id.in_(candidates.scalar_subquery()))
+        .values(
+            archived_at=datetime.utcnow(),
+            image_gallery=[],
+            updated_at=Offer.updated_at,
+            version=Offer.version + 1,
+        )
+        .returning(Offer.id)
+        .execution_options(synchronize_session=False)
+    )
+    archived = list(result.scalars())
+    if archived:
+        await session.execute(
+            update(MediaAsset)
+            .where(MediaAsset.offer_id.in_(archived))
+            .values(offer_id=None)
+            .execution_options(synchronize_session=False)
+        )
+    return archived
+
+
+def _unlink_files(paths: list[str]) -> None:
+    for public_path in paths:
+        file_path = (MEDIA_ROOT / public_path.removeprefix('/uploads/')).resolve()
+        if MEDIA_ROOT in file_path.parents:
+            file_path.unlink(missing_ok=True)
+
+
+def _stale_incoming(cutoff: float, limit: int) -> list[Path]:
+    if not INCOMING_DIR.is_dir():
+        return []
+    stale = []
+    for path in INCOMING_DIR.iterdir():
+        modified = path.stat().st_mtime
+        if path.is_file() and modified < cutoff:
+            stale.append((modified, path))
+    return [path for _, path in sorted(stale)[:limit]]
+
+
+def _settle_incoming(stale: list[Path], committed: set[str]) -> None:
+    for path in stale:
+        if path.name in committed:
+            # la fila se confirmó pero el proceso murió antes del rename: se completa aquí
+            path.replace(CAMERA_UPLOAD_DIR / path.name)
+        else:
+            path.unlink(missing_ok=True)
+
+
+async def sweep_incoming_uploads(session: AsyncSession, limit: int) -> list:
+    # subidas que quedaron en INCOMING_DIR por un fallo entre el spool y el rename posterior al commit
+    cutoff = time.time() - settings.orphan_media_grace_hours * 3600
+    stale = await asyncio.to_thread(_stale_incoming, cutoff, limit)
+    if not stale:
+        return []
+    result = await session.execute(
+        select(MediaAsset.path).where(MediaAsset.path.in_([f'/uploads/cameras/{path.name}' for path in stale]))
+    )
+    committed = {public_path.rsplit('/', 1)[-1] for public_path in result.scalars()}
+    await asyncio.to_thread(_settle_incoming, stale, committed)
+    return stale
+
+
+async def delete_orphan_media(session: AsyncSession, limit: int) -> list:
+    orphans = await find_orphans(session, timedelta(hours=settings.orphan_media_grace_hours), limit)
+    if not orphans:
+        return []
+    # primero el disco: si el commit falla, la fila sigue ahí y el siguiente ciclo la reintenta
+    await asyncio.to_thread(_unlink_files, [asset.path for asset in orphans])
+    await session.execute(
+        delete(MediaAsset)
+        .where(MediaAsset.id.in_([asset.id for asset in orphans]))
+        .execution_options(synchronize_session=False)
+    )
+    return orphans
+
+
+async def purge_outbox(session: AsyncSession, limit: int) -> list:
+    cutoff = datetime.utcnow() - timedelta(days=settings.outbox_retention_days)
+    processed = (
+        select(OutboxEvent.id)
+        .where(OutboxEvent.processed_at < cutoff)
+        .order_by(OutboxEvent.processed_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(
+        delete(OutboxEvent)
+        .where(OutboxEvent.id.in_(processed.scalar_subquery()))
+        .returning(OutboxEvent.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.all()
+
+
+# el orden importa: las ofertas archivadas liberan fotos que la limpieza de huérfanos borra en la misma corrida
+TASKS: dict[str, tuple[Step, AfterCommit | None]] = {
+    'cart_items': (expire_cart_items, forget_cart_items),
+    'sold_cameras': (archive_sold_cameras, None),
+    'declined_offers': (archive_declined_offers, None),
+    'incoming_uploads': (sweep_incoming_uploads, None),
+    'orphan_media': (delete_orphan_media, None),
+    'outbox_events': (purge_outbox, None),
+}
+
+
+async def run_maintenance() -> dict[str, int]:
+    report: dict[str, int] = {}
+    for name, (step, after_commit) in TASKS.items():
+        try:
+            report[name] = await _in_batches(step, after_commit)
+        except Exception:  # noqa: BLE001 - una tarea fallida no debe impedir las demás
+            logger.exception('Falló la tarea de mantenimiento %s', name)
+            report[name] = -1
+    # -1 marca una tarea fallida; solo se despierta al worker si de verdad se encolaron eventos
+    if report.get('sold_cameras', 0) > 0:
+        notify()
+    logger.info('Mantenimiento completado: %s', report)
+    return report
+
+
+async def _main() -> None:
+    try:
+        # serializado con las corridas periódicas de los workers web
+        async with advisory_lock(MAINTENANCE_LOCK_KEY):
+            report = await run_maintenance()
+        print(json.dumps(report, indent=2))
+    finally:
+        await close_redis()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
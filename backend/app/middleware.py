@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+from email.utils import parsedate_to_datetime
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # pragma: no cover - dependencias opcionales
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:  # pragma: no cover - dependencias opcionales
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+
+def _path_excluded(scope: Scope, excluded_prefixes: tuple[str, ...]) -> bool:
+    return any(scope['path'].startswith(prefix) for prefix in excluded_prefixes)
+
+
+def _parse_accept_encoding(value: str) -> dict[str, float]:
+    encodings: dict[str, float] = {}
+    for part in value.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[token] = quality
+    return encodings
+
+
+# acumula respuestas de un solo cuerpo para poder reescribirlas; las respuestas en streaming pasan intactas
+class _BufferedResponder:
+    def __init__(self, send: Send) -> None:
+        self.send = send
+        self.start_message: Message | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+        if message['type'] == 'http.response.start':
+            self.start_message = message
+            return
+        if message['type'] != 'http.response.body' or self.start_message is None:
+            await self.send(message)
+            return
+        if message.get('more_body', False):
+            self.passthrough = True
+            await self.send(self.start_message)
+            await self.send(message)
+            return
+        await self.finalize(self.start_message, message.get('body', b''))
+
+    async def finalize(self, start_message: Message, body: bytes) -> None:
+        await self.send(start_message)
+        await self.send({'type': 'http.response.body', 'body': body})
+
+
+class _CompressionResponder(_BufferedResponder):
+    def __init__(self, send: Send, encoding: str, middleware: 'CompressionMiddleware') -> None:
+        super().__init__(send)
+        self.encoding = encoding
+        self.middleware = middleware
+
+    async def finalize(self, start_message: Message, body: bytes) -> None:
+        headers = MutableHeaders(raw=start_message['headers'])
+        content_type = headers.get('content-type', '')
+        if (
+            len(body) < self.middleware.minimum_size
+            or 'content-encoding' in headers
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            await super().finalize(start_message, body)
+            return
+
+        body = self.middleware.compress(self.encoding, body)
+        headers['Content-Encoding'] = self.encoding
+        headers['Content-Length'] = str(len(body))
+        headers.add_vary_header('Accept-Encoding')
+        # otros bytes bajo el mismo validador: un ETag fuerte ya no sería cierto
+        etag = headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = f'W/{etag}'
+        await super().finalize(start_message, body)
+
+
+# compresión negociada (zstd, br, gzip) para respuestas JSON por encima de un umbral de tamaño
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 5,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        excluded_prefixes: tuple[str, ...] = ('/uploads',),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_prefixes = excluded_prefixes
+        self.zstd_compressor = zstandard.ZstdCompressor(level=zstd_level) if zstandard else None
+        # orden de preferencia ante q-values empatados: mejor relación velocidad/tamaño primero
+        self.supported = [
+            name
+            for name, available in (('zstd', zstandard is not None), ('br', brotli is not None), ('gzip', True))
+            if available
+        ]
+
+    def negotiate(self, accept_encoding: str) -> str | None:
+        offered = _parse_accept_encoding(accept_encoding)
+        wildcard = offered.get('*', 0.0)
+        best: str | None = None
+        best_quality = 0.0
+        for name in self.supported:
+            quality = offered.get(name, wildcard)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == 'zstd':
+            return self.zstd_compressor.compress(body)
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or _path_excluded(scope, self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.negotiate(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressionResponder(send, encoding, self))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == '*':
+        return True
+    # comparación débil (RFC 9110 §13.1.2): se ignora el prefijo W/
+    target = etag.removeprefix('W/')
+    return any(candidate.strip().removeprefix('W/') == target for candidate in if_none_match.split(','))
+
+
+def _not_modified_since(if_modified_since: str, last_modified: str) -> bool:
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+class _ConditionalResponder(_BufferedResponder):
+    def __init__(self, send: Send, request_headers: Headers) -> None:
+        super().__init__(send)
+        self.request_headers = request_headers
+
+    async def finalize(self, start_message: Message, body: bytes) -> None:
+        if start_message['status'] != 200:
+            await super().finalize(start_message, body)
+            return
+
+        headers = MutableHeaders(raw=start_message['headers'])
+        if 'etag' not in headers:
+            headers['ETag'] = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        headers.setdefault('Cache-Control', 'private, no-cache')
+
+        if_none_match = self.request_headers.get('if-none-match')
+        if_modified_since = self.request_headers.get('if-modified-since')
+        last_modified = headers.get('last-modified')
+        if if_none_match is not None:
+            not_modified = _etag_matches(if_none_match, headers['etag'])
+        else:
+            not_modified = bool(
+                if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified)
+            )
+
+        if not not_modified:
+            await super().finalize(start_message, body)
+            return
+
+        kept = MutableHeaders(
+            headers={
+                key: headers[key]
+                for key in ('etag', 'last-modified', 'cache-control', 'vary')
+                if key in headers
+            }
+        )
+        # el 304 no pasa por la compresión, pero debe anunciar el mismo Vary que tendría el 200 comprimido
+        kept.add_vary_header('Accept-Encoding')
+        await self.send({'type': 'http.response.start', 'status': 304, 'headers': kept.raw})
+        await self.send({'type': 'http.response.body', 'body': b''})
+
+
+# agrega ETag débil a las lecturas JSON y responde 304 cuando el cliente ya tiene la representación
+class ConditionalGetMiddleware:
+    def __init__(self, app: ASGIApp, excluded_prefixes: tuple[str, ...] = ('/uploads',)) -> None:
+        self.app = app
+        self.excluded_prefixes = excluded_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope['type'] != 'http'
+            or scope['method'] != 'GET'
+            or _path_excluded(scope, self.excluded_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _ConditionalResponder(send, Headers(scope=scope)))
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import pkgutil
+from dataclasses import dataclass
+from types import ModuleType
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..config import get_settings
+from ..database import engine
+from ..locks import MIGRATIONS_LOCK_KEY, advisory_lock
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    transactional: bool
+    module: ModuleType
+
+    async def upgrade(self, conn: AsyncConnection) -> None:
+        await self.module.upgrade(conn)
+
+
+def discover() -> list[Migration]:
+    # cada módulo vNNNN_nombre.py define VERSION, DESCRIPTION, TRANSACTIONAL y upgrade(conn)
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        if not info.name.startswith('v'):
+            continue
+        module = importlib.import_module(f'{__name__}.{info.name}')
+        migrations.append(
+            Migration(
+                version=module.VERSION,
+                description=module.DESCRIPTION,
+                transactional=getattr(module, 'TRANSACTIONAL', True),
+                module=module,
+            )
+        )
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f'Versiones de migración duplicadas: {versions}')
+    return migrations
+
+
+async def create_index_concurrently(conn: AsyncConnection, name: str, definition: str) -> None:
+    # un CONCURRENTLY interrumpido deja el índice INVALID; se elimina para que el reintento lo reconstruya
+    result = await conn.execute(
+        text(
+            'SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name'
+        ),
+        {'name': name},
+    )
+    if result.scalar():
+        await conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {name}'))
+    await conn.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}'))
+
+
+async def _ensure_version_table(conn: AsyncConnection) -> None:
+    await conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+            """
+        )
+    )
+
+
+async def _record(conn: AsyncConnection, migration: Migration) -> None:
+    await conn.execute(
+        text('INSERT INTO schema_migrations (version, description) VALUES (:version, :description)'),
+        {'version': migration.version, 'description': migration.description},
+    )
+
+
+async def applied_versions() -> set[int]:
+    async with engine.connect() as conn:
+        exists = await conn.execute(text("SELECT to_regclass('schema_migrations') IS NOT NULL"))
+        if not exists.scalar():
+            return set()
+        result = await conn.execute(text('SELECT version FROM schema_migrations'))
+        return set(result.scalars().all())
+
+
+async def upgrade() -> list[int]:
+    applied_now: list[int] = []
+    async with advisory_lock(MIGRATIONS_LOCK_KEY):
+        async with engine.begin() as conn:
+            await _ensure_version_table(conn)
+        applied = await applied_versions()
+
+        for migration in MIGRATIONS:
+            if migration.version in applied:
+                continue
+            logger.info('Aplicando migración %04d: %s', migration.version, migration.description)
+            # no esperar indefinidamente por locks de tablas calientes: un ALTER en cola detrás de una
+            # transacción larga bloquearía todas las lecturas y escrituras de la tabla mientras espera
+            if migration.transactional:
+                async with engine.begin() as conn:
+                    await conn.execute(text(f"SET LOCAL lock_timeout = '{settings.migration_lock_timeout}'"))
+                    await migration.upgrade(conn)
+                    await _record(conn, migration)
+            else:
+                # CREATE INDEX CONCURRENTLY y similares no pueden correr dentro de una transacción
+                async with engine.connect() as base_conn:
+                    conn = await base_conn.execution_options(isolation_level='AUTOCOMMIT')
+                    # sin transacción no hay SET LOCAL; se fija en la sesión y se restaura antes de devolverla al pool
+                    await conn.execute(text(f"SET lock_timeout = '{settings.migration_lock_timeout}'"))
+                    try:
+                        await migration.upgrade(conn)
+                        await _record(conn, migration)
+                    finally:
+                        await conn.execute(text('RESET lock_timeout'))
+            applied_now.append(migration.version)
+    return applied_now
+
+
+async def verify_schema() -> None:
+    applied = await applied_versions()
+    missing = [migration.version for migration in MIGRATIONS if migration.version not in applied]
+    if missing:
+        raise RuntimeError(
+            f'El esquema no está actualizado (faltan migraciones {missing}); '
+            'ejecuta `python -m app.migrations upgrade` antes de iniciar la API'
+        )
+
+
+MIGRATIONS = discover()
+LATEST_VERSION = MIGRATIONS[-1].version if MIGRATIONS else 0
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from ..database import engine
+from . import LATEST_VERSION, MIGRATIONS, applied_versions, upgrade
+
+
+async def _status() -> None:
+    applied = await applied_versions()
+    for migration in MIGRATIONS:
+        mark = 'x' if migration.version in applied else ' '
+        print(f'[{mark}] {migration.version:04d} {migration.description}')
+    print(f'Versión más reciente: {LATEST_VERSION:04d}')
+
+
+async def _upgrade() -> None:
+    applied = await upgrade()
+    if applied:
+        print('Migraciones aplicadas: ' + ', '.join(f'{version:04d}' for version in applied))
+    else:
+        print('El esquema ya está actualizado')
+
+
+async def _main(command: str) -> None:
+    try:
+        await (_status() if command == 'status' else _upgrade())
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Migraciones versionadas del esquema de GeneralStore.')
+    parser.add_argument('command', choices=['upgrade', 'status'])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.command))
+
+
+if __name__ == '__main__':
+    main()
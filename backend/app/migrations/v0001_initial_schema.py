@@ -0,0 +1,141 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 1
+DESCRIPTION = 'Esquema inicial (equivalente al create_all previo) y vistas de analítica'
+TRANSACTIONAL = True
+
+# IF NOT EXISTS en todo: las bases creadas antes con create_all adoptan esta versión sin cambios
+STATEMENTS = [
+    """
+    DO $$ BEGIN
+        CREATE TYPE camerastatus AS ENUM ('available', 'reserved', 'sold');
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$
+    """,
+    """
+    DO $$ BEGIN
+        CREATE TYPE offerstatus AS ENUM ('pending', 'accepted', 'declined', 'countered');
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id UUID PRIMARY KEY,
+        name VARCHAR(120) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        hashed_password VARCHAR(255) NOT NULL,
+        is_admin BOOLEAN NOT NULL,
+        preferred_currency VARCHAR(3) NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL
+    )
+    """,
+    'CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)',
+    """
+    CREATE TABLE IF NOT EXISTS cameras (
+        id UUID PRIMARY KEY,
+        title VARCHAR(160) NOT NULL,
+        brand VARCHAR(80) NOT NULL,
+        description TEXT NOT NULL,
+        price_cents INTEGER NOT NULL,
+        currency VARCHAR(3) NOT NULL,
+        condition VARCHAR(80) NOT NULL,
+        status camerastatus NOT NULL,
+        image_path VARCHAR(255),
+        image_gallery JSON NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL,
+        sold_at TIMESTAMPTZ,
+        CONSTRAINT camera_price_positive CHECK (price_cents >= 0)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS offers (
+        id UUID PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+        camera_title VARCHAR(160) NOT NULL,
+        brand VARCHAR(80) NOT NULL,
+        condition VARCHAR(80) NOT NULL,
+        asking_price_cents INTEGER NOT NULL,
+        preferred_currency VARCHAR(3) NOT NULL,
+        notes TEXT,
+        image_gallery JSON NOT NULL,
+        status offerstatus NOT NULL,
+        counter_offer_cents INTEGER,
+        created_at TIMESTAMPTZ NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cart_items (
+        id UUID PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+        camera_id UUID NOT NULL REFERENCES cameras (id) ON DELETE CASCADE,
+        created_at TIMESTAMPTZ NOT NULL,
+        CONSTRAINT user_camera_unique UNIQUE (user_id, camera_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS outbox_events (
+        id BIGSERIAL PRIMARY KEY,
+        topic VARCHAR(80) NOT NULL,
+        payload JSON NOT NULL,
+        attempts INTEGER NOT NULL,
+        last_error TEXT,
+        created_at TIMESTAMPTZ NOT NULL,
+        available_at TIMESTAMPTZ NOT NULL,
+        processed_at TIMESTAMPTZ,
+        failed_at TIMESTAMPTZ
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS outbox_events_pending_idx ON outbox_events (available_at)
+    WHERE processed_at IS NULL AND failed_at IS NULL
+    """,
+    # vistas de analítica congeladas aquí: cualquier cambio posterior va en una migración nueva.
+    # El índice único es el que permite REFRESH MATERIALIZED VIEW CONCURRENTLY.
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS analytics_sales_monthly AS
+    SELECT date_trunc('month', sold_at)::date AS month,
+           brand,
+           currency,
+           count(*)::int AS units_sold,
+           sum(price_cents)::bigint AS revenue_cents,
+           avg(extract(epoch FROM sold_at - created_at))::bigint AS avg_time_to_sell_seconds,
+           (percentile_cont(0.5) WITHIN GROUP (ORDER BY extract(epoch FROM sold_at - created_at)))::bigint
+               AS median_time_to_sell_seconds
+    FROM cameras
+    WHERE sold_at IS NOT NULL
+    GROUP BY 1, 2, 3
+    """,
+    'CREATE UNIQUE INDEX IF NOT EXISTS analytics_sales_monthly_key ON analytics_sales_monthly (month, brand, currency)',
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS analytics_offer_stats AS
+    SELECT date_trunc('month', created_at)::date AS month,
+           status::text AS status,
+           preferred_currency AS currency,
+           count(*)::int AS offers,
+           avg(asking_price_cents)::bigint AS avg_asking_cents,
+           avg(counter_offer_cents)::bigint AS avg_counter_cents,
+           (avg(counter_offer_cents - asking_price_cents) FILTER (WHERE counter_offer_cents IS NOT NULL))::bigint
+               AS avg_counter_delta_cents
+    FROM offers
+    GROUP BY 1, 2, 3
+    """,
+    'CREATE UNIQUE INDEX IF NOT EXISTS analytics_offer_stats_key ON analytics_offer_stats (month, status, currency)',
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS analytics_inventory AS
+    SELECT status::text AS status,
+           currency,
+           count(*)::int AS cameras,
+           sum(price_cents)::bigint AS value_cents
+    FROM cameras
+    GROUP BY 1, 2
+    """,
+    'CREATE UNIQUE INDEX IF NOT EXISTS analytics_inventory_key ON analytics_inventory (status, currency)',
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from . import create_index_concurrently
+
+VERSION = 2
+DESCRIPTION = 'Índices para las consultas por usuario, catálogo y borrado de cámaras'
+TRANSACTIONAL = False
+
+INDEXES = {
+    # my_offers filtra por usuario y ordena por fecha; get_all_offers solo ordena
+    'offers_user_created_idx': 'offers (user_id, created_at DESC)',
+    'offers_created_idx': 'offers (created_at DESC)',
+    # get_cart ordena por fecha; user_camera_unique ya cubre la búsqueda por (user_id, camera_id)
+    'cart_items_user_created_idx': 'cart_items (user_id, created_at DESC)',
+    # delete_camera y el ON DELETE CASCADE buscan por camera_id
+    'cart_items_camera_idx': 'cart_items (camera_id)',
+    'cameras_created_idx': 'cameras (created_at DESC)',
+}
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for name, definition in INDEXES.items():
+        await create_index_concurrently(conn, name, definition)
@@ -0,0 +1,12 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 3
+DESCRIPTION = 'Columna version en cameras y offers para control de concurrencia optimista'
+TRANSACTIONAL = True
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # ADD COLUMN con DEFAULT constante solo toca el catálogo (Postgres 11+), sin reescribir la tabla
+    await conn.execute(text('ALTER TABLE cameras ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1'))
+    await conn.execute(text('ALTER TABLE offers ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1'))
@@ -0,0 +1,35 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 4
+DESCRIPTION = 'Tabla media_assets con metadatos de imágenes subidas y su vínculo a ofertas y cámaras'
+TRANSACTIONAL = True
+
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS media_assets (
+        id UUID PRIMARY KEY,
+        path VARCHAR(255) NOT NULL UNIQUE,
+        owner_id UUID REFERENCES users (id) ON DELETE SET NULL,
+        offer_id UUID REFERENCES offers (id) ON DELETE SET NULL,
+        camera_id UUID REFERENCES cameras (id) ON DELETE SET NULL,
+        byte_size BIGINT NOT NULL,
+        content_hash VARCHAR(64) NOT NULL,
+        content_type VARCHAR(80) NOT NULL,
+        width INTEGER,
+        height INTEGER,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    # tabla nueva y vacía: los índices se crean dentro de la transacción sin bloquear a nadie
+    'CREATE INDEX IF NOT EXISTS media_assets_owner_idx ON media_assets (owner_id) INCLUDE (byte_size)',
+    'CREATE INDEX IF NOT EXISTS media_assets_offer_idx ON media_assets (offer_id)',
+    'CREATE INDEX IF NOT EXISTS media_assets_camera_idx ON media_assets (camera_id)',
+    'CREATE INDEX IF NOT EXISTS media_assets_unlinked_idx ON media_assets (created_at) '
+    'WHERE offer_id IS NULL AND camera_id IS NULL',
+)
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,26 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from . import create_index_concurrently
+
+VERSION = 5
+DESCRIPTION = 'Columnas archived_at e índices para el mantenimiento y el catálogo de inventario vivo'
+TRANSACTIONAL = False
+
+INDEXES = {
+    # el catálogo solo recorre inventario no archivado
+    'cameras_live_created_idx': 'cameras (created_at DESC) WHERE archived_at IS NULL',
+    # candidatos de cada tarea de mantenimiento, leídos en lotes ordenados
+    'cameras_sold_live_idx': 'cameras (sold_at) WHERE sold_at IS NOT NULL AND archived_at IS NULL',
+    'offers_declined_live_idx': "offers (updated_at) WHERE status = 'declined' AND archived_at IS NULL",
+    'cart_items_created_idx': 'cart_items (created_at)',
+    'outbox_events_processed_idx': 'outbox_events (processed_at) WHERE processed_at IS NOT NULL',
+}
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # columnas nulas sin DEFAULT: solo cambia el catálogo de Postgres, sin reescribir tablas
+    await conn.execute(text('ALTER TABLE cameras ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ'))
+    await conn.execute(text('ALTER TABLE offers ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ'))
+    for name, definition in INDEXES.items():
+        await create_index_concurrently(conn, name, definition)
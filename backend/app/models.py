@@ -4,7 +4,19 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -58,6 +70,9 @@ class Camera(Base):
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
     )
     sold_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # las cámaras vendidas hace tiempo se archivan: siguen accesibles por id pero salen del catálogo
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default=text('1'))
 
     cart_items: Mapped[list['CartItem']] = relationship(back_populates='camera')
 
@@ -84,6 +99,8 @@ class Offer(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default=text('1'))
 
     user: Mapped['User'] = relationship(back_populates='offers')
 
@@ -104,3 +121,61 @@ class CartItem(Base):
     __table_args__ = (
         UniqueConstraint('user_id', 'camera_id', name='user_camera_unique'),
     )
+
+
+class OutboxEvent(Base):
+    __tablename__ = 'outbox_events'
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    topic: Mapped[str] = mapped_column(String(80))
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index(
+            'outbox_events_pending_idx',
+            'available_at',
+            postgresql_where=text('processed_at IS NULL AND failed_at IS NULL'),
+        ),
+    )
+
+
+class MediaAsset(Base):
+    __tablename__ = 'media_assets'
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # ruta pública tal como se guarda en las galerías (/uploads/cameras/<archivo>)
+    path: Mapped[str] = mapped_column(String(255), unique=True)
+    owner_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL')
+    )
+    offer_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('offers.id', ondelete='SET NULL')
+    )
+    camera_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('cameras.id', ondelete='SET NULL')
+    )
+    byte_size: Mapped[int] = mapped_column(BigInteger)
+    content_hash: Mapped[str] = mapped_column(String(64))
+    content_type: Mapped[str] = mapped_column(String(80))
+    width: Mapped[int | None] = mapped_column(Integer)
+    height: Mapped[int | None] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (
+        # la cuota suma byte_size por dueño con un index-only scan
+        Index('media_assets_owner_idx', 'owner_id', postgresql_include=['byte_size']),
+        Index('media_assets_offer_idx', 'offer_id'),
+        Index('media_assets_camera_idx', 'camera_id'),
+        # huérfanos: archivos que ninguna oferta ni cámara referencia
+        Index(
+            'media_assets_unlinked_idx',
+            'created_at',
+            postgresql_where=text('offer_id IS NULL AND camera_id IS NULL'),
+        ),
+    )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import OutboxEvent
+
+CAMERA_CHANGED = 'camera.changed'
+MEDIA_UPLOADED = 'media.uploaded'
+
+Handler = Callable[[dict], Awaitable[None]]
+
+HANDLERS: dict[str, Handler] = {}
+_wakeup = asyncio.Event()
+
+
+def handler(topic: str) -> Callable[[Handler], Handler]:
+    def register(func: Handler) -> Handler:
+        HANDLERS[topic] = func
+        return func
+
+    return register
+
+
+def enqueue(session: AsyncSession, topic: str, payload: dict) -> None:
+    # se agrega a la misma sesión: el evento se confirma o descarta junto con el cambio de dominio
+    session.add(OutboxEvent(topic=topic, payload=payload))
+
+
+def notify() -> None:
+    # despierta al worker local justo después del commit en lugar de esperar al siguiente sondeo
+    _wakeup.set()
+
+
+async def wait_for_events(timeout: float) -> None:
+    try:
+        await asyncio.wait_for(_wakeup.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    _wakeup.clear()
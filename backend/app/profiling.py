@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# orden en que se carga la app; cada import mide solo lo que no estaba cargado ya
+IMPORT_STEPS = (
+    'app.config',
+    'app.database',
+    'app.models',
+    'app.redis_client',
+    'app.schemas',
+    'app.serializers',
+    'app.routers',
+    'app.main',
+)
+# módulos que deberían cargarse hasta el primer uso y no al importar la app
+DEFERRED_MODULES = ('passlib', 'bcrypt', 'httpx', 'numpy')
+
+
+@dataclass
+class StartupProfile:
+    phases: list[tuple[str, float]] = field(default_factory=list)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - started) * 1000))
+
+    def as_dict(self) -> dict[str, float]:
+        return {name: round(elapsed_ms, 2) for name, elapsed_ms in self.phases}
+
+
+startup_profile = StartupProfile()
+
+
+def deferred_modules_loaded() -> list[str]:
+    return [name for name in DEFERRED_MODULES if name in sys.modules]
+
+
+def _profile_imports() -> dict:
+    timings: dict[str, float] = {}
+    for module in IMPORT_STEPS:
+        started = time.perf_counter()
+        importlib.import_module(module)
+        timings[module] = round((time.perf_counter() - started) * 1000, 2)
+    return {
+        'imports_ms': timings,
+        'imports_total_ms': round(sum(timings.values()), 2),
+        'deferred_loaded_at_import': deferred_modules_loaded(),
+    }
+
+
+async def _profile_lifespan(wait_ready: float) -> dict:
+    from .main import app
+    from .readiness import readiness
+
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        lifespan_ms = (time.perf_counter() - started) * 1000
+        deadline = time.perf_counter() + wait_ready
+        while not readiness.ready and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        ready_ms = (time.perf_counter() - started) * 1000 if readiness.ready else None
+    return {
+        'lifespan_startup_ms': round(lifespan_ms, 2),
+        'ready_ms': round(ready_ms, 2) if ready_ms is not None else None,
+        'lifespan_phases_ms': startup_profile.as_dict(),
+        'readiness': readiness.as_dict(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Mide el costo de importar la app y de su arranque (lifespan).')
+    parser.add_argument('--imports-only', action='store_true', help='No ejecuta el lifespan (no requiere servicios)')
+    parser.add_argument('--wait-ready', type=float, default=30, help='Segundos máximos a esperar readiness')
+    args = parser.parse_args()
+
+    report = _profile_imports()
+    if not args.imports_only:
+        report.update(asyncio.run(_profile_lifespan(args.wait_ready)))
+    print(json.dumps(report, indent=2))
+    # falla si algún módulo diferido se cargó al importar: sirve como verificación en CI
+    if report['deferred_loaded_at_import']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
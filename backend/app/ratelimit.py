@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+from fastapi import Depends, HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from .config import get_settings
+from .deps import get_current_user
+from .models import User
+from .redis_client import session_store
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Token bucket sobre varias llaves en un solo viaje: solo consume si todas las llaves tienen saldo.
+# KEYS: un bucket por alcance. ARGV: pares (capacidad, tokens por ms) en el mismo orden que KEYS.
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local states = {}
+local retry_after = 0
+for index, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[index * 2 - 1])
+    local rate = tonumber(ARGV[index * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if tokens == nil then
+        tokens = capacity
+        ts = now
+    end
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    if tokens < 1 then
+        retry_after = math.max(retry_after, math.ceil((1 - tokens) / rate))
+    end
+    states[index] = {tokens, capacity, rate}
+end
+local allowed = retry_after == 0
+for index, key in ipairs(KEYS) do
+    local tokens = states[index][1]
+    if allowed then
+        tokens = tokens - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(states[index][2] / states[index][3]) + 1000)
+end
+if allowed then
+    return 0
+end
+return retry_after
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    scope: str
+    capacity: int
+    period_seconds: float
+
+    @property
+    def tokens_per_ms(self) -> float:
+        return self.capacity / (self.period_seconds * 1000)
+
+
+def parse_policy(spec: str) -> tuple[RateLimit, ...]:
+    # formato: "ip:30/60,user:5/60" -> 30 peticiones por IP y 5 por usuario cada 60 segundos
+    limits = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        scope, _, rule = part.partition(':')
+        capacity, _, period = rule.partition('/')
+        limits.append(RateLimit(scope=scope.strip(), capacity=int(capacity), period_seconds=float(period)))
+    return tuple(limits)
+
+
+POLICIES = {
+    'login': parse_policy(settings.rate_limit_login),
+    'upload': parse_policy(settings.rate_limit_upload),
+    'checkout': parse_policy(settings.rate_limit_checkout),
+}
+
+
+@lru_cache(maxsize=1)
+def _token_bucket():
+    return session_store().register_script(TOKEN_BUCKET_SCRIPT)
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else 'unknown'
+
+
+async def enforce_rate_limit(policy: str, request: Request, subject: str | None = None) -> None:
+    if not settings.rate_limit_enabled:
+        return
+
+    keys: list[str] = []
+    args: list[float] = []
+    for limit in POLICIES[policy]:
+        identity = client_ip(request) if limit.scope == 'ip' else subject
+        if identity is None:
+            continue
+        keys.append(f'ratelimit:{policy}:{limit.scope}:{identity}')
+        args.extend((limit.capacity, limit.tokens_per_ms))
+    if not keys:
+        return
+
+    try:
+        retry_after_ms = int(await _token_bucket()(keys=keys, args=args))
+    except RedisError:
+        # si Redis no responde preferimos atender a rechazar todo el tráfico
+        logger.warning('Rate limiter sin Redis; se permite la petición', exc_info=True)
+        return
+
+    if retry_after_ms > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail='Demasiadas solicitudes, intenta más tarde',
+            headers={'Retry-After': str(max(1, math.ceil(retry_after_ms / 1000)))},
+        )
+
+
+def rate_limit_by_user(policy: str):
+    async def dependency(request: Request, user: User = Depends(get_current_user)) -> None:
+        await enforce_rate_limit(policy, request, subject=str(user.id))
+
+    return dependency
+
+
+class ConcurrencyLimiter:
+    # presupuesto de trabajo en curso por proceso; al excederlo se descarta carga con 503
+    def __init__(self, name: str, limit: int, retry_after_seconds: int = 1) -> None:
+        self.name = name
+        self.limit = limit
+        self.retry_after_seconds = retry_after_seconds
+        self.in_flight = 0
+
+    async def __call__(self):
+        if self.in_flight >= self.limit:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Servidor ocupado, intenta de nuevo en un momento',
+                headers={'Retry-After': str(self.retry_after_seconds)},
+            )
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+
+login_concurrency = ConcurrencyLimiter('login', settings.max_in_flight_login)
+upload_concurrency = ConcurrencyLimiter('upload', settings.max_in_flight_upload)
+checkout_concurrency = ConcurrencyLimiter('checkout', settings.max_in_flight_checkout)
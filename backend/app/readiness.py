@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import signal
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class Readiness:
+    startup_complete: bool = False
+    draining: bool = False
+    warmup_total: int = 0
+    warmup_completed: int = 0
+    warmup_failed: list[str] = field(default_factory=list)
+    caches_warm: bool = False
+
+    @property
+    def ready(self) -> bool:
+        return self.startup_complete and self.caches_warm and not self.draining
+
+    def start_warmup(self, total: int) -> None:
+        self.warmup_total = total
+        self.warmup_completed = 0
+        self.warmup_failed = []
+        self.caches_warm = False
+
+    def finish_warmup(self) -> None:
+        self.caches_warm = True
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), 'ready': self.ready}
+
+
+readiness = Readiness()
+
+
+def install_drain_handler(delay_seconds: float) -> None:
+    # uvicorn deja de aceptar conexiones apenas recibe SIGTERM; antes se marca draining y se sigue
+    # atendiendo `delay_seconds` para que el balanceador vea /health/ready en 503 y saque la réplica
+    previous = signal.getsignal(signal.SIGTERM)
+    if delay_seconds <= 0 or not callable(previous):
+        return
+    loop = asyncio.get_running_loop()
+
+    def handle_sigterm(signum, frame) -> None:
+        if readiness.draining:
+            # un segundo SIGTERM apaga de inmediato
+            previous(signum, frame)
+            return
+        readiness.draining = True
+        loop.call_soon_threadsafe(loop.call_later, delay_seconds, previous, signum, frame)
+
+    try:
+        signal.signal(signal.SIGTERM, handle_sigterm)
+    except ValueError:
+        # fuera del hilo principal (p. ej. servidores de prueba) no se pueden instalar handlers
+        pass
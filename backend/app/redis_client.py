@@ -6,18 +6,34 @@ from .config import get_settings
 
 settings = get_settings()
 
-_session_store = redis.from_url(settings.session_redis_url, decode_responses=True)
-_cache_store = redis.from_url(settings.cache_redis_url, decode_responses=True)
+# los clientes se crean en el primer uso: importar la app no construye pools
+_session_store: redis.Redis | None = None
+_cache_store: redis.Redis | None = None
+_cache_bytes_store: redis.Redis | None = None
 
 
 def session_store() -> redis.Redis:
+    global _session_store
+    if _session_store is None:
+        _session_store = redis.from_url(settings.session_redis_url, decode_responses=True)
     return _session_store
 
 
 def cache_store() -> redis.Redis:
+    global _cache_store
+    if _cache_store is None:
+        _cache_store = redis.from_url(settings.cache_redis_url, decode_responses=True)
     return _cache_store
 
 
+def cache_bytes_store() -> redis.Redis:
+    # misma base que cache_store pero sin decodificar: para cuerpos JSON que se sirven tal cual
+    global _cache_bytes_store
+    if _cache_bytes_store is None:
+        _cache_bytes_store = redis.from_url(settings.cache_redis_url)
+    return _cache_bytes_store
+
+
 async def get_session_store() -> AsyncGenerator[redis.Redis, None]:
     yield session_store()
 
@@ -27,5 +43,6 @@ async def get_cache_store() -> AsyncGenerator[redis.Redis, None]:
 
 
 async def close_redis() -> None:
-    await _session_store.close()
-    await _cache_store.close()
+    for client in (_session_store, _cache_store, _cache_bytes_store):
+        if client is not None:
+            await client.close()
@@ -1,3 +1,3 @@
-from . import auth, cameras, cart, currency, offers
+from . import analytics, auth, cameras, cart, currency, health, media, offers
 
-__all__ = ['auth', 'cameras', 'cart', 'currency', 'offers']
+__all__ = ['analytics', 'auth', 'cameras', 'cart', 'currency', 'health', 'media', 'offers']
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..database import get_session
+from ..deps import get_current_admin
+from ..locks import ANALYTICS_REFRESH_LOCK_KEY, advisory_lock
+from ..schemas import InventoryReport, OfferStatsReport, SalesReport
+from ..services import analytics
+from ..tasks import mark_ran
+
+settings = get_settings()
+
+router = APIRouter(prefix='/analytics', tags=['analitica'])
+
+
+@router.get('/sales', response_model=SalesReport)
+async def sales_report(
+    since: date | None = None,
+    until: date | None = None,
+    brand: str | None = None,
+    admin=Depends(get_current_admin),
+    session: AsyncSession = Depends(get_session),
+):
+    _ = admin
+    items = await analytics.sales_by_month(session, since, until, brand)
+    return SalesReport(items=items, refreshed_at=await analytics.refreshed_at())
+
+
+@router.get('/offers', response_model=OfferStatsReport)
+async def offers_report(
+    since: date | None = None,
+    admin=Depends(get_current_admin),
+    session: AsyncSession = Depends(get_session),
+):
+    _ = admin
+    items = await analytics.offer_stats(session, since)
+    return OfferStatsReport(items=items, refreshed_at=await analytics.refreshed_at())
+
+
+@router.get('/inventory', response_model=InventoryReport)
+async def inventory_report(admin=Depends(get_current_admin), session: AsyncSession = Depends(get_session)):
+    _ = admin
+    items = await analytics.inventory(session)
+    return InventoryReport(items=items, refreshed_at=await analytics.refreshed_at())
+
+
+@router.post('/refresh')
+async def refresh_reports(admin=Depends(get_current_admin)):
+    _ = admin
+    # mismo lock que la corrida periódica: nunca dos REFRESH a la vez
+    async with advisory_lock(ANALYTICS_REFRESH_LOCK_KEY):
+        await analytics.refresh_views()
+    await mark_ran(analytics.REFRESH_TASK, settings.analytics_refresh_seconds)
+    return {'detail': 'Reportes actualizados', 'refreshed_at': await analytics.refreshed_at()}
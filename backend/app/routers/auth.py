@@ -1,19 +1,21 @@
 from __future__ import annotations
 
-import json
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
 from ..database import get_session
-from ..deps import get_current_user, session_token
+from ..deps import get_current_admin, get_current_user, session_token
 from ..models import User
+from ..ratelimit import enforce_rate_limit, login_concurrency
 from ..redis_client import get_session_store
 from ..schemas import SessionResponse, UserBase, UserCreate, UserLogin
-from ..utils.security import generate_session_token, get_password_hash, verify_password
+from ..sessions import create_session, revoke_session, revoke_user_sessions
+from ..utils.security import get_password_hash, verify_password
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 settings = get_settings()
@@ -28,7 +30,7 @@ async def register_user(payload: UserCreate, session: AsyncSession = Depends(get
     user = User(
         name=payload.name,
         email=payload.email.lower(),
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await run_in_threadpool(get_password_hash, payload.password),
         preferred_currency=settings.default_currency.upper(),
         is_admin=False,
     )
@@ -38,31 +40,48 @@ async def register_user(payload: UserCreate, session: AsyncSession = Depends(get
     return user
 
 
-@router.post('/login', response_model=SessionResponse)
+@router.post('/login', response_model=SessionResponse, dependencies=[Depends(login_concurrency)])
 async def login_user(
     payload: UserLogin,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     store=Depends(get_session_store),
 ):
+    await enforce_rate_limit('login', request, subject=payload.email.lower())
     result = await session.execute(select(User).where(User.email == payload.email.lower()))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    # bcrypt bloquea la CPU: se ejecuta fuera del event loop para no frenar al resto de peticiones
+    if not user or not await run_in_threadpool(verify_password, payload.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Credenciales inválidas')
 
-    token = generate_session_token()
-    cache_key = f'session:{token}'
-    session_payload = json.dumps({'user_id': str(user.id)})
-    await store.set(cache_key, session_payload, ex=settings.session_ttl_seconds)
+    token = await create_session(store, user.id)
 
     return SessionResponse(token=token, user=user, expires_in_seconds=settings.session_ttl_seconds)
 
 
 @router.post('/logout')
 async def logout_user(token: str = Depends(session_token), store=Depends(get_session_store)):
-    await store.delete(f'session:{token}')
+    await revoke_session(store, token)
     return {'detail': 'Sesión cerrada'}
 
 
+@router.post('/logout-all')
+async def logout_everywhere(user=Depends(get_current_user), store=Depends(get_session_store)):
+    revoked = await revoke_user_sessions(store, user.id)
+    return {'detail': 'Sesiones cerradas', 'count': revoked}
+
+
+@router.delete('/users/{user_id}/sessions')
+async def revoke_sessions_for_user(
+    user_id: uuid.UUID,
+    admin=Depends(get_current_admin),
+    store=Depends(get_session_store),
+):
+    _ = admin
+    revoked = await revoke_user_sessions(store, user_id)
+    return {'detail': 'Sesiones revocadas', 'count': revoked}
+
+
 @router.get('/me', response_model=UserBase)
 async def read_current_user(user=Depends(get_current_user)):
     return user
@@ -1,58 +1,57 @@
 from __future__ import annotations
 
-import json
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, delete
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_session
 from ..deps import get_current_admin
 from ..models import Camera, CameraStatus, CartItem
-from ..redis_client import cache_store
+from ..outbox import CAMERA_CHANGED, enqueue, notify
 from ..schemas import CameraBase, CameraCreate, CameraListResponse, CameraUpdate
-from ..utils.money import price_to_cents
+from ..serializers import dumps, json_response, parse_timestamp
+from ..services import media as media_service
+from ..services.catalog import invalidate_camera_changes_now, load_catalog, load_cameras
+from ..utils.http import expected_version, set_last_modified, set_version_etag, version_conflict
+from ..utils.money import Money, price_to_cents
+from ..utils.security import generate_uuid
 
 router = APIRouter(prefix='/cameras', tags=['camaras'])
 
 
-async def _invalidate_camera_cache() -> None:
-    await cache_store().delete('cameras:all')
+def _enqueue_camera_changed(session: AsyncSession, camera_id: uuid.UUID) -> None:
+    # la invalidación se hace en línea tras el commit y además viaja por el outbox, por si el proceso muere antes
+    enqueue(session, CAMERA_CHANGED, {'camera_ids': [str(camera_id)]})
+
+
+async def _link_gallery(session: AsyncSession, camera_id: uuid.UUID, paths: list[str | None]) -> None:
+    try:
+        await media_service.link_camera(session, camera_id, paths)
+    except media_service.MediaConflict as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Imágenes en uso por otra oferta o cámara: {", ".join(exc.paths)}',
+        ) from exc
 
 
 @router.get('', response_model=CameraListResponse)
 async def list_cameras(session: AsyncSession = Depends(get_session)):
-    cache_key = 'cameras:all'
-    cache = cache_store()
-    cached = await cache.get(cache_key)
-    if cached:
-        try:
-            payload = json.loads(cached)
-            cameras = [CameraBase(**item) for item in payload]
-            return CameraListResponse(items=cameras)
-        except (json.JSONDecodeError, TypeError):
-            await cache.delete(cache_key)
-
-    result = await session.execute(select(Camera).order_by(Camera.created_at.desc()))
-    cameras = result.scalars().all()
-    items = []
-    for camera in cameras:
-        data = CameraBase.model_validate(camera).model_dump(mode='json')
-        # fuerza el precio calculado desde cents para evitar serializaciones en cero
-        data['price'] = camera.price_cents / 100
-        items.append(data)
-    await cache.set(cache_key, json.dumps(items, default=str), ex=300)
-    return CameraListResponse(items=[CameraBase(**item) for item in items])
+    # sin Last-Modified: borrar o archivar una cámara no sube el máximo de updated_at; basta el ETag del cuerpo
+    return json_response(await load_catalog(session))
 
 
 @router.get('/{camera_id}', response_model=CameraBase)
 async def get_camera(camera_id: uuid.UUID, session: AsyncSession = Depends(get_session)):
-    camera = await session.get(Camera, camera_id)
-    if not camera:
+    data = (await load_cameras(session, [camera_id])).get(camera_id)
+    if not data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Cámara no encontrada')
-    return camera
+    response = json_response(dumps(data))
+    set_last_modified(response, parse_timestamp(data['updated_at']))
+    set_version_etag(response, data['version'])
+    return response
 
 
 @router.post('', response_model=CameraBase)
@@ -62,20 +61,26 @@ async def create_camera(
     session: AsyncSession = Depends(get_session),
 ):
     _ = admin
+    price = Money.from_amount(payload.price, payload.currency)
     camera = Camera(
+        id=generate_uuid(),
         title=payload.title,
         brand=payload.brand,
         description=payload.description,
         condition=payload.condition,
-        price_cents=price_to_cents(payload.price),
-        currency=payload.currency.upper(),
+        price_cents=price.cents,
+        currency=price.currency,
         image_path=payload.image_path,
         image_gallery=payload.image_gallery or [],
     )
     session.add(camera)
+    await session.flush()
+    await _link_gallery(session, camera.id, [camera.image_path, *camera.image_gallery])
+    _enqueue_camera_changed(session, camera.id)
     await session.commit()
+    await invalidate_camera_changes_now([camera.id])
     await session.refresh(camera)
-    await _invalidate_camera_cache()
+    notify()
     return camera
 
 
@@ -83,25 +88,44 @@ async def create_camera(
 async def update_camera(
     camera_id: uuid.UUID,
     payload: CameraUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
     admin=Depends(get_current_admin),
     session: AsyncSession = Depends(get_session),
 ):
     _ = admin
-    camera = await session.get(Camera, camera_id)
-    if not camera:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Cámara no encontrada')
-
     update_data = payload.model_dump(exclude_unset=True)
     if 'price' in update_data:
-        camera.price_cents = price_to_cents(update_data.pop('price'))
-    for attr, value in update_data.items():
-        if attr == 'status' and value == CameraStatus.sold:
-            camera.sold_at = camera.sold_at or datetime.utcnow()
-        setattr(camera, attr, value)
-
+        update_data['price_cents'] = price_to_cents(update_data.pop('price'))
+    if update_data.get('status') == CameraStatus.sold:
+        update_data['sold_at'] = func.coalesce(Camera.sold_at, datetime.utcnow())
+
+    # un solo UPDATE ... WHERE version = :v RETURNING: sin lectura previa ni refresh posterior
+    conditions = [Camera.id == camera_id]
+    version = expected_version(if_match)
+    if version is not None:
+        conditions.append(Camera.version == version)
+    result = await session.execute(
+        update(Camera)
+        .where(*conditions)
+        .values(**update_data, version=Camera.version + 1)
+        .returning(Camera)
+        .execution_options(synchronize_session=False)
+    )
+    camera = result.scalar_one_or_none()
+    if camera is None:
+        exists = await session.scalar(select(Camera.id).where(Camera.id == camera_id))
+        if not exists:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Cámara no encontrada')
+        raise version_conflict('La cámara')
+
+    if 'image_path' in update_data or 'image_gallery' in update_data:
+        await _link_gallery(session, camera.id, [camera.image_path, *(camera.image_gallery or [])])
+    _enqueue_camera_changed(session, camera.id)
     await session.commit()
-    await session.refresh(camera)
-    await _invalidate_camera_cache()
+    await invalidate_camera_changes_now([camera.id])
+    notify()
+    set_version_etag(response, camera.version)
     return camera
 
 
@@ -120,6 +144,8 @@ async def delete_camera(
     await session.execute(delete(CartItem).where(CartItem.camera_id == camera_id))
 
     await session.delete(camera)
+    _enqueue_camera_changed(session, camera_id)
     await session.commit()
-    await _invalidate_camera_cache()
+    await invalidate_camera_changes_now([camera_id])
+    notify()
     return {'detail': 'Cámara eliminada'}
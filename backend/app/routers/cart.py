@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -10,21 +11,51 @@ from sqlalchemy.orm import selectinload
 from ..database import get_session
 from ..deps import get_current_user
 from ..models import Camera, CameraStatus, CartItem
-from ..schemas import AddToCartRequest, CartItemBase, CameraBase
+from ..outbox import CAMERA_CHANGED, enqueue, notify
+from ..ratelimit import checkout_concurrency, rate_limit_by_user
+from ..schemas import AddToCartRequest, CartItemBase, CameraBase, CartSummary
+from ..serializers import dumps, json_response
+from ..services import cart_summary
+from ..services.catalog import invalidate_camera_changes_now, load_cameras
+from ..services.exchange import ExchangeUnavailable
 
 router = APIRouter(prefix='/cart', tags=['carrito'])
 
 
-@router.get('', response_model=list[CartItemBase])
-async def get_cart(user=Depends(get_current_user), session: AsyncSession = Depends(get_session)):
-    result = await session.execute(
-        select(CartItem)
-        .options(selectinload(CartItem.camera))
-        .where(CartItem.user_id == user.id)
+def cart_items_statement(user_id: uuid.UUID):
+    return (
+        select(CartItem.id, CartItem.camera_id, CartItem.created_at)
+        .where(CartItem.user_id == user_id)
         .order_by(CartItem.created_at.desc())
     )
-    items = [CartItemBase.model_validate(item) for item in result.scalars().all()]
-    return items
+
+
+@router.get('', response_model=list[CartItemBase])
+async def get_cart(user=Depends(get_current_user), session: AsyncSession = Depends(get_session)):
+    result = await session.execute(cart_items_statement(user.id))
+    rows = result.all()
+    cameras = await load_cameras(session, (camera_id for _, camera_id, _ in rows))
+    items = [
+        {'id': item_id, 'camera': cameras[camera_id], 'created_at': created_at}
+        for item_id, camera_id, created_at in rows
+        if camera_id in cameras
+    ]
+    # sin Last-Modified: quitar un item no cambia ningún timestamp; el ETag del cuerpo sí lo refleja
+    return json_response(dumps(items))
+
+
+@router.get('/summary', response_model=CartSummary)
+async def get_cart_summary(
+    currency: str | None = Query(default=None, min_length=3, max_length=3),
+    user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        return await cart_summary.get_summary(session, user.id, currency)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Moneda no soportada') from exc
+    except ExchangeUnavailable as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail='Tasas de cambio no disponibles') from exc
 
 
 @router.post('', response_model=CartItemBase)
@@ -40,23 +71,23 @@ async def add_to_cart(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='La cámara ya fue vendida')
 
     existing = await session.execute(
-        select(CartItem.id).where(CartItem.camera_id == payload.camera_id, CartItem.user_id == user.id)
+        select(CartItem.id, CartItem.created_at).where(
+            CartItem.camera_id == payload.camera_id, CartItem.user_id == user.id
+        )
     )
-    existing_id = existing.scalar_one_or_none()
-    if existing_id:
-        loaded = await session.get(CartItem, existing_id, options=[selectinload(CartItem.camera)])
-        if loaded:
-            return CartItemBase(
-                id=loaded.id,
-                camera=CameraBase.model_validate(loaded.camera),
-                created_at=loaded.created_at,
-            )
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='No se pudo cargar el carrito')
+    existing_row = existing.one_or_none()
+    if existing_row:
+        return CartItemBase(
+            id=existing_row.id,
+            camera=CameraBase.model_validate(camera),
+            created_at=existing_row.created_at,
+        )
 
     new_item = CartItem(user_id=user.id, camera_id=camera.id)
     session.add(new_item)
     await session.commit()
     await session.refresh(new_item)
+    await cart_summary.record_item_added(user.id, camera)
     return CartItemBase(
         id=new_item.id,
         camera=CameraBase.model_validate(camera),
@@ -64,7 +95,7 @@ async def add_to_cart(
     )
 
 
-@router.post('/checkout')
+@router.post('/checkout', dependencies=[Depends(checkout_concurrency), Depends(rate_limit_by_user('checkout'))])
 async def checkout_cart(
     user=Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
@@ -73,12 +104,24 @@ async def checkout_cart(
         select(CartItem).options(selectinload(CartItem.camera)).where(CartItem.user_id == user.id)
     )
     items = result.scalars().all()
+    camera_ids = [item.camera_id for item in items]
+    sold_at = datetime.utcnow()
     for item in items:
         if item.camera:
             item.camera.status = CameraStatus.sold
+            item.camera.sold_at = item.camera.sold_at or sold_at
+            # la venta cambia la cámara serializada: su ETag (version) también debe cambiar
+            item.camera.version = Camera.version + 1
         await session.delete(item)
+    # las cámaras vendidas cambian de disponibilidad en el catálogo y en los carritos de otros usuarios
+    if camera_ids:
+        enqueue(session, CAMERA_CHANGED, {'camera_ids': [str(camera_id) for camera_id in camera_ids]})
 
     await session.commit()
+    if camera_ids:
+        await invalidate_camera_changes_now(camera_ids)
+    notify()
+    await cart_summary.record_checkout(user.id, camera_ids)
     return {'detail': 'Compra registrada', 'count': len(items)}
 
 
@@ -97,4 +140,5 @@ async def remove_from_cart(
 
     await session.delete(cart_item)
     await session.commit()
+    await cart_summary.record_item_removed(user.id, camera_id)
     return {'detail': 'Eliminado del carrito'}
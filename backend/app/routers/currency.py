@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, status
 
 from ..schemas import CurrencyQuoteResponse
-from ..services.exchange import ExchangeService
+from ..services.exchange import DEFAULT_RATE_SYMBOLS, ExchangeService, ExchangeUnavailable
 
 router = APIRouter(prefix='/currency', tags=['monedas'])
 service = ExchangeService()
 
 
 @router.get('/rates', response_model=CurrencyQuoteResponse)
-async def get_rates(base: str = Query(default='USD', min_length=3, max_length=3), symbols: str = 'USD,MXN,EUR'):
+async def get_rates(
+    base: str = Query(default='USD', min_length=3, max_length=3),
+    symbols: str = ','.join(DEFAULT_RATE_SYMBOLS),
+):
     symbol_list = [symbol.strip().upper() for symbol in symbols.split(',') if symbol.strip()]
-    quotes = await service.quote(base_currency=base, symbols=symbol_list)
+    try:
+        quotes = await service.quote(base_currency=base, symbols=symbol_list)
+    except ExchangeUnavailable as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail='Tasas de cambio no disponibles') from exc
     return CurrencyQuoteResponse(quotes=quotes)
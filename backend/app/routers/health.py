@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from ..database import engine
+from ..readiness import readiness
+from ..redis_client import cache_store, session_store
+
+router = APIRouter(prefix='/health', tags=['salud'])
+
+
+@router.get('/live')
+async def liveness():
+    return {'status': 'ok'}
+
+
+@router.get('/ready')
+async def readiness_probe():
+    checks: dict[str, bool] = {}
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+        checks['database'] = True
+    except Exception:  # noqa: BLE001 - cualquier falla deja la réplica fuera del balanceador
+        checks['database'] = False
+    for name, store in (('session_redis', session_store()), ('cache_redis', cache_store())):
+        try:
+            checks[name] = bool(await store.ping())
+        except Exception:  # noqa: BLE001
+            checks[name] = False
+
+    ready = readiness.ready and all(checks.values())
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'status': 'ready' if ready else 'unavailable', 'checks': checks, **readiness.as_dict()},
+    )
@@ -1,60 +1,89 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
 from pathlib import Path
 from typing import List
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
+from ..database import get_session
 from ..deps import get_current_user
+from ..models import MediaAsset
+from ..outbox import MEDIA_UPLOADED, enqueue, notify
+from ..ratelimit import rate_limit_by_user, upload_concurrency
+from ..services import media as media_service
+from ..storage import CAMERA_UPLOAD_DIR, INCOMING_DIR
 
 router = APIRouter(prefix='/media', tags=['media'])
 
 settings = get_settings()
-# Alinea con main.py para que los archivos queden en /app/media
-BASE_DIR = Path(__file__).resolve().parents[2]
-MEDIA_ROOT = (BASE_DIR / settings.media_root).resolve()
-CAMERA_UPLOAD_DIR = MEDIA_ROOT / 'cameras'
-CAMERA_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-ALLOWED_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+ALLOWED_IMAGE_EXTENSIONS = set(media_service.CONTENT_TYPES)
 
 
-@router.post('/upload')
+def _discard(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+@router.post('/upload', dependencies=[Depends(upload_concurrency), Depends(rate_limit_by_user('upload'))])
 async def upload_media(
     files: List[UploadFile] = File(...),
     user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
-    _ = user
     if not files:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='No se enviaron archivos')
 
-    saved_files: list[dict[str, str]] = []
-
-    for file in files:
-        original_name = Path(file.filename or '')
-        suffix = original_name.suffix.lower()
-        if suffix not in ALLOWED_IMAGE_EXTENSIONS:
-            continue
-
-        unique_name = f'{uuid.uuid4().hex}{suffix}'
-        target_path = CAMERA_UPLOAD_DIR / unique_name
-
-        contents = await file.read()
-        target_path.write_bytes(contents)
-
-        saved_files.append(
-            {
-                'filename': file.filename,
-                'path': f'/uploads/cameras/{unique_name}',
-            },
-        )
-
-    if not saved_files:
+    accepted = [
+        (file, suffix)
+        for file in files
+        if (suffix := Path(file.filename or '').suffix.lower()) in ALLOWED_IMAGE_EXTENSIONS
+    ]
+    if not accepted:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Ningún archivo tiene un formato de imagen soportado',
         )
 
+    # los archivos quedan en INCOMING_DIR hasta que el commit confirma sus filas; si algo falla se borran
+    pending: list[tuple[Path, Path]] = []
+    assets: list[MediaAsset] = []
+    try:
+        for file, suffix in accepted:
+            unique_name = f'{uuid.uuid4().hex}{suffix}'
+            incoming_path = INCOMING_DIR / unique_name
+            pending.append((incoming_path, CAMERA_UPLOAD_DIR / unique_name))
+            # copia y hash por bloques fuera del event loop: las imágenes pueden pesar varios MB
+            meta = await asyncio.to_thread(media_service.spool_upload, file.file, incoming_path, suffix)
+            assets.append(MediaAsset(path=f'/uploads/cameras/{unique_name}', owner_id=user.id, **meta))
+
+        if settings.media_quota_bytes > 0:
+            incoming_bytes = sum(asset.byte_size for asset in assets)
+            if not await media_service.reserve_quota(session, user.id, incoming_bytes, settings.media_quota_bytes):
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail='Superaste el espacio disponible para tus fotos',
+                )
+        session.add_all(assets)
+        saved_files = [{'filename': file.filename, 'path': asset.path} for (file, _), asset in zip(accepted, assets)]
+
+        # las dimensiones se leen en el worker del outbox, fuera de la petición
+        enqueue(
+            session,
+            MEDIA_UPLOADED,
+            {'owner_id': str(user.id), 'paths': [item['path'] for item in saved_files]},
+        )
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        await asyncio.to_thread(_discard, [incoming for incoming, _ in pending])
+        raise
+
+    for incoming, final in pending:
+        incoming.replace(final)
+    notify()
     return {'files': saved_files}
@@ -2,18 +2,40 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_session
 from ..deps import get_current_admin, get_current_user
 from ..models import Offer, OfferStatus
 from ..schemas import OfferAction, OfferBase, OfferCreate, OfferListResponse
-from ..utils.money import price_to_cents
+from ..serializers import OFFER_SERIALIZER, encode_items, json_response
+from ..services import media as media_service
+from ..utils.http import expected_version, set_version_etag, version_conflict
+from ..utils.money import Money, price_to_cents
 
 router = APIRouter(prefix='/offers', tags=['ofertas'])
 
+MIN_GALLERY_PHOTOS = 3
+
+
+def _offer_list_response(rows) -> Response:
+    # sin Last-Modified: archivar una oferta no sube el máximo de updated_at; basta el ETag del cuerpo
+    return json_response(encode_items(OFFER_SERIALIZER.to_dicts(rows)))
+
+
+def my_offers_statement(user_id: uuid.UUID):
+    return (
+        OFFER_SERIALIZER.select()
+        .where(Offer.user_id == user_id, Offer.archived_at.is_(None))
+        .order_by(Offer.created_at.desc())
+    )
+
+
+def all_offers_statement():
+    return OFFER_SERIALIZER.select().where(Offer.archived_at.is_(None)).order_by(Offer.created_at.desc())
+
 
 @router.post('', response_model=OfferBase)
 async def submit_offer(
@@ -21,19 +43,29 @@ async def submit_offer(
     user=Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    if len(payload.image_gallery or []) < 3:
+    gallery = list(dict.fromkeys(payload.image_gallery or []))
+    if len(gallery) < MIN_GALLERY_PHOTOS:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Debes subir al menos 3 fotos de la cámara')
+    asking_price = Money.from_amount(payload.asking_price, payload.preferred_currency)
     offer = Offer(
         user_id=user.id,
         camera_title=payload.camera_title,
         brand=payload.brand,
         condition=payload.condition,
-        asking_price_cents=price_to_cents(payload.asking_price),
-        preferred_currency=payload.preferred_currency.upper(),
+        asking_price_cents=asking_price.cents,
+        preferred_currency=asking_price.currency,
         notes=payload.notes,
-        image_gallery=payload.image_gallery or [],
+        image_gallery=gallery,
     )
     session.add(offer)
+    await session.flush()
+    claimed = await media_service.claim_for_offer(session, offer.id, user.id, gallery)
+    if len(claimed) != len(gallery):
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Algunas fotos no existen, no te pertenecen o ya están en otra oferta',
+        )
     await session.commit()
     await session.refresh(offer)
     return offer
@@ -41,40 +73,55 @@ async def submit_offer(
 
 @router.get('/me', response_model=OfferListResponse)
 async def my_offers(user=Depends(get_current_user), session: AsyncSession = Depends(get_session)):
-    result = await session.execute(select(Offer).where(Offer.user_id == user.id).order_by(Offer.created_at.desc()))
-    items = [OfferBase.model_validate(offer) for offer in result.scalars().all()]
-    return OfferListResponse(items=items)
+    result = await session.execute(my_offers_statement(user.id))
+    return _offer_list_response(result.all())
 
 
 @router.get('/admin', response_model=OfferListResponse)
 async def get_all_offers(admin=Depends(get_current_admin), session: AsyncSession = Depends(get_session)):
     _ = admin
-    result = await session.execute(select(Offer).order_by(Offer.created_at.desc()))
-    items = [OfferBase.model_validate(offer) for offer in result.scalars().all()]
-    return OfferListResponse(items=items)
+    result = await session.execute(all_offers_statement())
+    return _offer_list_response(result.all())
 
 
 @router.post('/{offer_id}/decision', response_model=OfferBase)
 async def decide_offer(
     offer_id: uuid.UUID,
     payload: OfferAction,
+    response: Response,
+    if_match: str | None = Header(default=None),
     user=Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    offer = await session.get(Offer, offer_id)
-    if not offer:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Oferta no encontrada')
-
-    # Permitir solo admin o dueño de la oferta
-    if not user.is_admin and offer.user_id != user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='No autorizado')
-
-    offer.status = payload.action
+    values: dict = {'status': payload.action}
     if payload.action == OfferStatus.countered and payload.counter_amount is not None:
-        offer.counter_offer_cents = price_to_cents(payload.counter_amount)
+        values['counter_offer_cents'] = price_to_cents(payload.counter_amount)
     elif payload.action != OfferStatus.countered:
-        offer.counter_offer_cents = None
+        values['counter_offer_cents'] = None
+
+    # Permitir solo admin o dueño de la oferta; la autorización y la versión viajan en el mismo UPDATE
+    conditions = [Offer.id == offer_id]
+    if not user.is_admin:
+        conditions.append(Offer.user_id == user.id)
+    version = expected_version(if_match)
+    if version is not None:
+        conditions.append(Offer.version == version)
+    result = await session.execute(
+        update(Offer)
+        .where(*conditions)
+        .values(**values, version=Offer.version + 1)
+        .returning(Offer)
+        .execution_options(synchronize_session=False)
+    )
+    offer = result.scalar_one_or_none()
+    if offer is None:
+        owner_id = await session.scalar(select(Offer.user_id).where(Offer.id == offer_id))
+        if owner_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Oferta no encontrada')
+        if not user.is_admin and owner_id != user.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='No autorizado')
+        raise version_conflict('La oferta')
 
     await session.commit()
-    await session.refresh(offer)
+    set_version_etag(response, offer.version)
     return offer
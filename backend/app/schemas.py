@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field, FieldValidationInfo, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, Field, FieldValidationInfo, computed_field, field_validator
 
 from .models import CameraStatus, OfferStatus
+from .utils.money import cents_to_float
 
 
 class UserBase(BaseModel):
@@ -44,7 +46,6 @@ class CameraBase(BaseModel):
     description: str
     condition: str
     price_cents: int
-    price: float = 0
     currency: str
     status: CameraStatus
     image_path: str | None
@@ -52,13 +53,13 @@ class CameraBase(BaseModel):
     created_at: datetime
     updated_at: datetime
     sold_at: datetime | None
+    version: int = 1
 
-    @model_validator(mode='before')
-    @classmethod
-    def compute_price(cls, values):
-        if isinstance(values, dict) and 'price_cents' in values:
-            values.setdefault('price', values['price_cents'] / 100)
-        return values
+    # derivado siempre de los centavos, también al validar desde entidades ORM
+    @computed_field
+    @property
+    def price(self) -> float:
+        return cents_to_float(self.price_cents)
 
     class Config:
         from_attributes = True
@@ -69,7 +70,7 @@ class CameraCreate(BaseModel):
     brand: str
     description: str
     condition: str
-    price: float = Field(gt=0)
+    price: Decimal = Field(gt=0)
     currency: str = Field(default='USD', min_length=3, max_length=3)
     image_path: str | None = None
     image_gallery: list[str] = Field(default_factory=list)
@@ -80,7 +81,7 @@ class CameraUpdate(BaseModel):
     brand: str | None = None
     description: str | None = None
     condition: str | None = None
-    price: float | None = Field(default=None, gt=0)
+    price: Decimal | None = Field(default=None, gt=0)
     status: CameraStatus | None = None
     currency: str | None = Field(default=None, min_length=3, max_length=3)
     image_path: str | None = None
@@ -104,6 +105,7 @@ class OfferBase(BaseModel):
     counter_offer_cents: int | None
     created_at: datetime
     updated_at: datetime
+    version: int = 1
 
     class Config:
         from_attributes = True
@@ -113,7 +115,7 @@ class OfferCreate(BaseModel):
     camera_title: str
     brand: str
     condition: str
-    asking_price: float = Field(gt=0)
+    asking_price: Decimal = Field(gt=0)
     preferred_currency: str = Field(default='USD', min_length=3, max_length=3)
     notes: str = Field(min_length=1, max_length=500)
     image_gallery: list[str] = Field(default_factory=list)
@@ -121,7 +123,7 @@ class OfferCreate(BaseModel):
 
 class OfferAction(BaseModel):
     action: OfferStatus
-    counter_amount: float | None = Field(default=None, gt=0)
+    counter_amount: Decimal | None = Field(default=None, gt=0)
 
     @field_validator('action')
     @classmethod
@@ -132,7 +134,7 @@ class OfferAction(BaseModel):
 
     @field_validator('counter_amount')
     @classmethod
-    def validate_counter(cls, value: float | None, info: FieldValidationInfo):
+    def validate_counter(cls, value: Decimal | None, info: FieldValidationInfo):
         action = info.data.get('action') if info.data else None
         if action == OfferStatus.countered and value is None:
             raise ValueError('counter_amount is required for countered action')
@@ -156,6 +158,20 @@ class AddToCartRequest(BaseModel):
     camera_id: UUID
 
 
+class CartSubtotal(BaseModel):
+    currency: str
+    amount_cents: int
+    amount: float
+
+
+class CartSummary(BaseModel):
+    item_count: int
+    subtotals: list[CartSubtotal]
+    total: CartSubtotal | None = None
+    all_available: bool
+    unavailable_camera_ids: list[UUID] = []
+
+
 class CurrencyQuote(BaseModel):
     base_currency: str
     quote_currency: str
@@ -165,3 +181,45 @@ class CurrencyQuote(BaseModel):
 
 class CurrencyQuoteResponse(BaseModel):
     quotes: list[CurrencyQuote]
+
+
+class SalesRow(BaseModel):
+    month: date
+    brand: str
+    currency: str
+    units_sold: int
+    revenue_cents: int
+    avg_time_to_sell_seconds: int | None
+    median_time_to_sell_seconds: int | None
+
+
+class SalesReport(BaseModel):
+    items: list[SalesRow]
+    refreshed_at: datetime | None
+
+
+class OfferStatsRow(BaseModel):
+    month: date
+    status: str
+    currency: str
+    offers: int
+    avg_asking_cents: int | None
+    avg_counter_cents: int | None
+    avg_counter_delta_cents: int | None
+
+
+class OfferStatsReport(BaseModel):
+    items: list[OfferStatsRow]
+    refreshed_at: datetime | None
+
+
+class InventoryRow(BaseModel):
+    status: str
+    currency: str
+    cameras: int
+    value_cents: int
+
+
+class InventoryReport(BaseModel):
+    items: list[InventoryRow]
+    refreshed_at: datetime | None
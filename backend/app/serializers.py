@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+import orjson
+from fastapi import Response
+from sqlalchemy import Select, select
+from sqlalchemy.orm import InstrumentedAttribute
+
+from .models import Camera, Offer
+from .utils.money import cents_to_float
+
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class RowSerializer:
+    # Convierte tuplas de columnas en dicts con zip sobre los nombres precalculados,
+    # sin hidratar entidades ORM ni pasar por la validación de pydantic.
+    def __init__(
+        self,
+        fields: dict[str, InstrumentedAttribute],
+        computed: dict[str, tuple[str, Callable[[Any], Any]]] | None = None,
+    ) -> None:
+        self.fields = fields
+        self.columns = list(fields.values())
+        self.index = {name: position for position, name in enumerate(fields)}
+        keys = tuple(fields)
+        derived = tuple((name, self.index[source], func) for name, (source, func) in (computed or {}).items())
+
+        def to_dict(row: Sequence[Any]) -> dict:
+            data = dict(zip(keys, row))
+            for name, position, func in derived:
+                data[name] = func(row[position])
+            return data
+
+        self.to_dict: Callable[[Sequence[Any]], dict] = to_dict
+
+    def select(self) -> Select:
+        return select(*self.columns)
+
+    def to_dicts(self, rows: Iterable[Sequence[Any]]) -> list[dict]:
+        to_dict = self.to_dict
+        return [to_dict(row) for row in rows]
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, option=JSON_OPTIONS)
+
+
+def encode_items(items: list[dict]) -> bytes:
+    return dumps({'items': items})
+
+
+def json_response(body: bytes) -> Response:
+    # el cuerpo ya está codificado: se evita la validación y serialización de response_model
+    return Response(content=body, media_type='application/json')
+
+
+def parse_timestamp(value: str | datetime | None) -> datetime | None:
+    # las entradas leídas de caché traen fechas ISO; las recién consultadas, datetime
+    if not value or isinstance(value, datetime):
+        return value or None
+    return datetime.fromisoformat(value)
+
+
+CAMERA_SERIALIZER = RowSerializer(
+    {
+        'id': Camera.id,
+        'title': Camera.title,
+        'brand': Camera.brand,
+        'description': Camera.description,
+        'condition': Camera.condition,
+        'price_cents': Camera.price_cents,
+        'currency': Camera.currency,
+        'status': Camera.status,
+        'image_path': Camera.image_path,
+        'image_gallery': Camera.image_gallery,
+        'created_at': Camera.created_at,
+        'updated_at': Camera.updated_at,
+        'sold_at': Camera.sold_at,
+        'version': Camera.version,
+    },
+    computed={'price': ('price_cents', cents_to_float)},
+)
+
+OFFER_SERIALIZER = RowSerializer(
+    {
+        'id': Offer.id,
+        'camera_title': Offer.camera_title,
+        'brand': Offer.brand,
+        'condition': Offer.condition,
+        'asking_price_cents': Offer.asking_price_cents,
+        'preferred_currency': Offer.preferred_currency,
+        'notes': Offer.notes,
+        'image_gallery': Offer.image_gallery,
+        'status': Offer.status,
+        'counter_offer_cents': Offer.counter_offer_cents,
+        'created_at': Offer.created_at,
+        'updated_at': Offer.updated_at,
+        'version': Offer.version,
+    }
+)
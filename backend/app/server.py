@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import uvicorn
+
+from .config import get_settings
+from .database import engine
+from .startup import run_startup_tasks
+
+settings = get_settings()
+
+
+def worker_count() -> int:
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    # la app es asíncrona: un worker por núcleo basta para saturar la CPU
+    return max(1, os.cpu_count() or 1)
+
+
+async def _prepare() -> None:
+    try:
+        await run_startup_tasks()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    # el trabajo de arranque se hace una vez en el proceso padre; los workers solo lo omiten
+    asyncio.run(_prepare())
+    os.environ['SKIP_STARTUP_TASKS'] = 'true'
+    get_settings.cache_clear()
+
+    uvicorn.run(
+        'app.main:app',
+        host=settings.host,
+        port=settings.port,
+        workers=worker_count(),
+        timeout_graceful_shutdown=settings.graceful_timeout_seconds,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+    )
+
+
+if __name__ == '__main__':
+    main()
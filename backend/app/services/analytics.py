@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import engine
+from ..redis_client import cache_store
+
+REFRESHED_AT_KEY = 'analytics:refreshed_at'
+# nombre de la tarea periódica; comparte su marca de última corrida con POST /analytics/refresh
+REFRESH_TASK = 'analytics'
+
+# Vistas materializadas con índice único: REFRESH ... CONCURRENTLY las reconstruye sin bloquear lecturas
+# y sin tomar locks que frenen escrituras en cameras/offers.
+# definidas en app/migrations (v0001); cambiar una vista requiere una migración nueva
+ANALYTICS_VIEWS = ('analytics_sales_monthly', 'analytics_offer_stats', 'analytics_inventory')
+
+
+async def refresh_views() -> None:
+    for name in ANALYTICS_VIEWS:
+        # cada vista en su propia transacción para no retener snapshots largos
+        async with engine.begin() as conn:
+            await conn.execute(text(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {name}'))
+    await cache_store().set(REFRESHED_AT_KEY, datetime.utcnow().isoformat())
+
+
+async def refreshed_at() -> datetime | None:
+    value = await cache_store().get(REFRESHED_AT_KEY)
+    return datetime.fromisoformat(value) if value else None
+
+
+async def sales_by_month(
+    session: AsyncSession,
+    since: date | None,
+    until: date | None,
+    brand: str | None,
+) -> list[dict]:
+    result = await session.execute(
+        text(
+            """
+            SELECT month, brand, currency, units_sold, revenue_cents,
+                   avg_time_to_sell_seconds, median_time_to_sell_seconds
+            FROM analytics_sales_monthly
+            WHERE (CAST(:since AS date) IS NULL OR month >= date_trunc('month', CAST(:since AS date)))
+              AND (CAST(:until AS date) IS NULL OR month <= CAST(:until AS date))
+              AND (CAST(:brand AS text) IS NULL OR brand = :brand)
+            ORDER BY month DESC, revenue_cents DESC
+            """
+        ),
+        {'since': since, 'until': until, 'brand': brand},
+    )
+    return [dict(row) for row in result.mappings().all()]
+
+
+async def offer_stats(session: AsyncSession, since: date | None) -> list[dict]:
+    result = await session.execute(
+        text(
+            """
+            SELECT month, status, currency, offers, avg_asking_cents, avg_counter_cents, avg_counter_delta_cents
+            FROM analytics_offer_stats
+            WHERE CAST(:since AS date) IS NULL OR month >= date_trunc('month', CAST(:since AS date))
+            ORDER BY month DESC, status, currency
+            """
+        ),
+        {'since': since},
+    )
+    return [dict(row) for row in result.mappings().all()]
+
+
+async def inventory(session: AsyncSession) -> list[dict]:
+    result = await session.execute(
+        text('SELECT status, currency, cameras, value_cents FROM analytics_inventory ORDER BY status, currency')
+    )
+    return [dict(row) for row in result.mappings().all()]
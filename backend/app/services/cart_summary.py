@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from functools import lru_cache
+
+from redis.exceptions import WatchError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..models import Camera, CameraStatus, CartItem
+from ..redis_client import cache_store
+from ..utils.money import Money, convert_cents_batch
+from .exchange import ExchangeService
+
+settings = get_settings()
+
+# cart:{user} -> hash {camera_id.hex: "price_cents:currency:status"} más el marcador "_" para carritos vacíos
+# camera_carts:{camera} -> set de usuarios cuyo resumen contiene la cámara (para invalidar al editarla)
+# cart_gen:{user} -> contador que sube con cada cambio; una reconstrucción que lo ve cambiar no se guarda
+SUMMARY_TTL_SECONDS = 60 * 60
+PRESENCE_FIELD = '_'
+
+# solo modifica resúmenes ya construidos; uno ausente se reconstruye completo desde la base
+HSET_IF_EXISTS_SCRIPT = """
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+def _summary_key(user_id: uuid.UUID) -> str:
+    return f'cart:{user_id.hex}'
+
+
+def _camera_carts_key(camera_id: uuid.UUID) -> str:
+    return f'camera_carts:{camera_id.hex}'
+
+
+def _generation_key(user_id: uuid.UUID | str) -> str:
+    user_hex = user_id if isinstance(user_id, str) else user_id.hex
+    return f'cart_gen:{user_hex}'
+
+
+def _bump_generation(pipe, user_id: uuid.UUID | str) -> None:
+    pipe.incr(_generation_key(user_id))
+    pipe.expire(_generation_key(user_id), SUMMARY_TTL_SECONDS)
+
+
+def _encode_entry(price_cents: int, currency: str, camera_status: CameraStatus) -> str:
+    return f'{price_cents}:{currency}:{camera_status.value}'
+
+
+@lru_cache(maxsize=1)
+def _hset_if_exists():
+    return cache_store().register_script(HSET_IF_EXISTS_SCRIPT)
+
+
+async def _rebuild(session: AsyncSession, user_id: uuid.UUID) -> dict[str, str]:
+    cache = cache_store()
+    generation_key = _generation_key(user_id)
+    generation = await cache.get(generation_key)
+    result = await session.execute(
+        select(CartItem.camera_id, Camera.price_cents, Camera.currency, Camera.status)
+        .join(Camera, Camera.id == CartItem.camera_id)
+        .where(CartItem.user_id == user_id)
+    )
+    entries = {PRESENCE_FIELD: '1'}
+    camera_ids = []
+    for camera_id, price_cents, currency, camera_status in result.all():
+        entries[camera_id.hex] = _encode_entry(price_cents, currency, camera_status)
+        camera_ids.append(camera_id)
+
+    # WATCH sobre el contador: si un alta, baja o invalidación ocurrió durante la consulta, no se cachea
+    async with cache.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(generation_key)
+            if await pipe.get(generation_key) != generation:
+                return entries
+            pipe.multi()
+            pipe.delete(_summary_key(user_id))
+            pipe.hset(_summary_key(user_id), mapping=entries)
+            pipe.expire(_summary_key(user_id), SUMMARY_TTL_SECONDS)
+            for camera_id in camera_ids:
+                pipe.sadd(_camera_carts_key(camera_id), user_id.hex)
+                pipe.expire(_camera_carts_key(camera_id), SUMMARY_TTL_SECONDS)
+            await pipe.execute()
+        except WatchError:
+            pass
+    return entries
+
+
+def _money_payload(money: Money) -> dict:
+    return {'currency': money.currency, 'amount_cents': money.cents, 'amount': money.as_float()}
+
+
+async def _convert_total(subtotals: list[Money], currency: str) -> Money:
+    service = ExchangeService()
+    rates = []
+    for subtotal in subtotals:
+        if subtotal.currency == currency:
+            rates.append(1)
+            continue
+        # mismas llaves de caché que calienta el arranque (base -> resto de monedas soportadas)
+        symbols = {code for code in settings.supported_currency_list if code != subtotal.currency} | {currency}
+        quoted = await service.fetch_rates(subtotal.currency, symbols)
+        if currency not in quoted:
+            raise LookupError(f'Sin tasa de {subtotal.currency} a {currency}')
+        rates.append(quoted[currency])
+    converted = convert_cents_batch([subtotal.cents for subtotal in subtotals], rates)
+    return Money(sum(converted), currency)
+
+
+async def get_summary(session: AsyncSession, user_id: uuid.UUID, currency: str | None = None) -> dict:
+    entries = await cache_store().hgetall(_summary_key(user_id))
+    if not entries:
+        entries = await _rebuild(session, user_id)
+
+    subtotals: dict[str, Money] = {}
+    unavailable: list[uuid.UUID] = []
+    count = 0
+    for field, value in entries.items():
+        if field == PRESENCE_FIELD:
+            continue
+        price_cents, item_currency, camera_status = value.split(':')
+        count += 1
+        item_price = Money(int(price_cents), item_currency)
+        subtotals[item_price.currency] = subtotals.get(item_price.currency, Money(0, item_price.currency)) + item_price
+        if camera_status != CameraStatus.available.value:
+            unavailable.append(uuid.UUID(hex=field))
+
+    ordered = [subtotals[code] for code in sorted(subtotals)]
+    total = await _convert_total(ordered, currency.upper()) if currency else None
+    return {
+        'item_count': count,
+        'subtotals': [_money_payload(subtotal) for subtotal in ordered],
+        'total': _money_payload(total) if total else None,
+        'all_available': not unavailable,
+        'unavailable_camera_ids': unavailable,
+    }
+
+
+async def record_item_added(user_id: uuid.UUID, camera: Camera) -> None:
+    await _hset_if_exists()(
+        keys=[_summary_key(user_id), _generation_key(user_id)],
+        args=[camera.id.hex, _encode_entry(camera.price_cents, camera.currency, camera.status), SUMMARY_TTL_SECONDS],
+    )
+    async with cache_store().pipeline(transaction=False) as pipe:
+        pipe.sadd(_camera_carts_key(camera.id), user_id.hex)
+        pipe.expire(_camera_carts_key(camera.id), SUMMARY_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def record_item_removed(user_id: uuid.UUID, camera_id: uuid.UUID) -> None:
+    async with cache_store().pipeline(transaction=False) as pipe:
+        _bump_generation(pipe, user_id)
+        pipe.hdel(_summary_key(user_id), camera_id.hex)
+        pipe.srem(_camera_carts_key(camera_id), user_id.hex)
+        await pipe.execute()
+
+
+async def record_checkout(user_id: uuid.UUID, camera_ids: Iterable[uuid.UUID]) -> None:
+    async with cache_store().pipeline(transaction=False) as pipe:
+        _bump_generation(pipe, user_id)
+        # el carrito queda vacío: se deja el marcador para no reconstruirlo en la siguiente lectura
+        pipe.delete(_summary_key(user_id))
+        pipe.hset(_summary_key(user_id), PRESENCE_FIELD, '1')
+        pipe.expire(_summary_key(user_id), SUMMARY_TTL_SECONDS)
+        for camera_id in camera_ids:
+            pipe.srem(_camera_carts_key(camera_id), user_id.hex)
+        await pipe.execute()
+
+
+async def invalidate_camera_carts(camera_ids: Iterable[uuid.UUID]) -> None:
+    cache = cache_store()
+    for camera_id in camera_ids:
+        carts_key = _camera_carts_key(camera_id)
+        users = await cache.smembers(carts_key)
+        async with cache.pipeline(transaction=False) as pipe:
+            for user_hex in users:
+                _bump_generation(pipe, user_hex)
+                pipe.delete(f'cart:{user_hex}')
+            pipe.delete(carts_key)
+            await pipe.execute()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import Iterable
+
+import orjson
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Camera
+from ..redis_client import cache_bytes_store, cache_store
+from ..serializers import CAMERA_SERIALIZER, dumps, encode_items
+from .cart_summary import invalidate_camera_carts
+
+logger = logging.getLogger(__name__)
+
+# respuesta JSON completa de GET /cameras, ya codificada (llave nueva: la anterior era un hash)
+CATALOG_CACHE_KEY = 'cameras:catalog:body'
+CATALOG_CACHE_TTL_SECONDS = 300
+CAMERA_CACHE_TTL_SECONDS = 3600
+
+
+def _camera_key(camera_id: uuid.UUID) -> str:
+    return f'camera:{camera_id.hex}'
+
+
+def catalog_statement():
+    # solo inventario vivo: las cámaras archivadas siguen disponibles por id (load_cameras)
+    return CAMERA_SERIALIZER.select().where(Camera.archived_at.is_(None)).order_by(Camera.created_at.desc())
+
+
+async def load_catalog(session: AsyncSession) -> bytes:
+    # cliente de bytes: el cuerpo cacheado se devuelve sin decodificar ni volver a codificar
+    cache = cache_bytes_store()
+    body = await cache.get(CATALOG_CACHE_KEY)
+    if body:
+        return body
+
+    result = await session.execute(catalog_statement())
+    payload = encode_items(CAMERA_SERIALIZER.to_dicts(result.all()))
+    await cache.set(CATALOG_CACHE_KEY, payload, ex=CATALOG_CACHE_TTL_SECONDS)
+    return payload
+
+
+async def load_cameras(session: AsyncSession, camera_ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, dict]:
+    ids = list(dict.fromkeys(camera_ids))
+    if not ids:
+        return {}
+
+    cache = cache_bytes_store()
+    found: dict[uuid.UUID, dict] = {}
+    missing: list[uuid.UUID] = []
+    for camera_id, cached in zip(ids, await cache.mget([_camera_key(camera_id) for camera_id in ids])):
+        if cached:
+            found[camera_id] = orjson.loads(cached)
+        else:
+            missing.append(camera_id)
+
+    if missing:
+        result = await session.execute(CAMERA_SERIALIZER.select().where(Camera.id.in_(missing)))
+        loaded = {row.id: CAMERA_SERIALIZER.to_dict(row) for row in result.all()}
+        if loaded:
+            async with cache.pipeline(transaction=False) as pipe:
+                for camera_id, data in loaded.items():
+                    pipe.set(_camera_key(camera_id), dumps(data), ex=CAMERA_CACHE_TTL_SECONDS)
+                await pipe.execute()
+        found.update(loaded)
+    return found
+
+
+async def invalidate_catalog() -> None:
+    await cache_store().delete(CATALOG_CACHE_KEY)
+
+
+async def invalidate_cameras(camera_ids: Iterable[uuid.UUID]) -> None:
+    keys = [_camera_key(camera_id) for camera_id in camera_ids]
+    if keys:
+        await cache_store().delete(*keys)
+
+
+async def invalidate_camera_changes(camera_ids: Iterable[uuid.UUID]) -> None:
+    ids = list(camera_ids)
+    await invalidate_catalog()
+    await invalidate_cameras(ids)
+    await invalidate_camera_carts(ids)
+
+
+async def invalidate_camera_changes_now(camera_ids: Iterable[uuid.UUID]) -> None:
+    # tras el commit, para que la siguiente lectura ya vea la versión nueva; el evento CAMERA_CHANGED
+    # del outbox sigue siendo el reintento durable si Redis falla aquí
+    try:
+        await invalidate_camera_changes(camera_ids)
+    except RedisError:
+        logger.warning('No se pudo invalidar la caché de cámaras; queda para el outbox', exc_info=True)
@@ -2,15 +2,42 @@ from __future__ import annotations
 
 import json
 from datetime import datetime
-from typing import Sequence
-
-import httpx
+from typing import TYPE_CHECKING, Sequence
 
 from ..config import get_settings
 from ..redis_client import cache_store
 
+if TYPE_CHECKING:
+    import httpx
+
 settings = get_settings()
 
+# símbolos por omisión de GET /currency/rates; el calentamiento llena la misma llave
+DEFAULT_RATE_SYMBOLS = ('USD', 'MXN', 'EUR')
+
+_client: httpx.AsyncClient | None = None
+
+
+class ExchangeUnavailable(RuntimeError):
+    pass
+
+
+def http_client() -> httpx.AsyncClient:
+    # un solo cliente por proceso reutiliza conexiones; httpx se importa en la primera consulta
+    global _client
+    if _client is None:
+        import httpx
+
+        _client = httpx.AsyncClient(timeout=10)
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 class ExchangeService:
     def __init__(self, base_url: str | None = None) -> None:
@@ -18,26 +45,36 @@ class ExchangeService:
 
     async def fetch_rates(self, base_currency: str, symbols: Sequence[str]) -> dict[str, float]:
         normalized_base = base_currency.upper()
-        normalized_symbols = sorted({code.upper() for code in symbols if code})
-        symbol_string = ','.join(normalized_symbols)
+        requested = {code.upper() for code in symbols if code}
+        # la base siempre vale 1: fuera de la llave para que `USD,MXN,EUR` y `MXN,EUR` compartan caché
+        quoted = sorted(requested - {normalized_base})
+        if requested and not quoted:
+            return {normalized_base: 1.0}
+        symbol_string = ','.join(quoted)
         cache_key = f"exchange:{normalized_base}:{symbol_string or 'ALL'}"
         store = cache_store()
 
         cached = await store.get(cache_key)
         if cached:
-            return json.loads(cached)
+            rates = json.loads(cached)
+        else:
+            params = {'base': normalized_base}
+            if symbol_string:
+                params['symbols'] = symbol_string
 
-        params = {'base': normalized_base}
-        if symbol_string:
-            params['symbols'] = symbol_string
+            import httpx  # ya cargado por http_client(); aquí solo para sus excepciones
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(f'{self.base_url}/latest', params=params)
-            response.raise_for_status()
-            payload = response.json()
+            try:
+                response = await http_client().get(f'{self.base_url}/latest', params=params)
+                response.raise_for_status()
+                payload = response.json()
+            except (httpx.HTTPError, ValueError) as exc:
+                raise ExchangeUnavailable(f'El proveedor de tasas no respondió: {exc}') from exc
 
-        rates = payload.get('rates', {})
-        await store.set(cache_key, json.dumps(rates), ex=1800)
+            rates = payload.get('rates', {})
+            await store.set(cache_key, json.dumps(rates), ex=1800)
+        if normalized_base in requested:
+            rates[normalized_base] = 1.0
         return rates
 
     async def quote(self, base_currency: str, symbols: Sequence[str]) -> list[dict[str, str | float | datetime]]:
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import MediaAsset, User
+
+CONTENT_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
+
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+class MediaConflict(ValueError):
+    def __init__(self, paths: Iterable[str]) -> None:
+        self.paths = sorted(paths)
+        super().__init__(f'Imágenes no disponibles: {", ".join(self.paths)}')
+
+
+def spool_upload(source: BinaryIO, target: Path, suffix: str) -> dict:
+    # copia por bloques calculando tamaño y hash: el archivo nunca se carga completo en memoria
+    digest = hashlib.sha256()
+    size = 0
+    with target.open('wb') as output:
+        while chunk := source.read(SPOOL_CHUNK_BYTES):
+            digest.update(chunk)
+            output.write(chunk)
+            size += len(chunk)
+    return {
+        'byte_size': size,
+        'content_hash': digest.hexdigest(),
+        'content_type': CONTENT_TYPES.get(suffix, 'application/octet-stream'),
+    }
+
+
+async def reserve_quota(session: AsyncSession, owner_id: uuid.UUID, incoming_bytes: int, quota_bytes: int) -> bool:
+    # la fila del usuario queda bloqueada hasta el commit: subidas concurrentes del mismo dueño se serializan
+    # y cada una suma lo ya insertado por las anteriores
+    await session.execute(select(User.id).where(User.id == owner_id).with_for_update())
+    used = await session.scalar(
+        select(func.coalesce(func.sum(MediaAsset.byte_size), 0)).where(MediaAsset.owner_id == owner_id)
+    )
+    return int(used or 0) + incoming_bytes <= quota_bytes
+
+
+async def claim_for_offer(
+    session: AsyncSession, offer_id: uuid.UUID, owner_id: uuid.UUID, paths: Iterable[str]
+) -> set[str]:
+    # valida y vincula en un solo UPDATE: solo cuentan archivos del usuario que ninguna otra oferta usa
+    result = await session.execute(
+        update(MediaAsset)
+        .where(
+            MediaAsset.path.in_(set(paths)),
+            MediaAsset.owner_id == owner_id,
+            MediaAsset.offer_id.is_(None),
+        )
+        .values(offer_id=offer_id)
+        .returning(MediaAsset.path)
+        .execution_options(synchronize_session=False)
+    )
+    return set(result.scalars())
+
+
+async def link_camera(session: AsyncSession, camera_id: uuid.UUID, paths: Iterable[str]) -> None:
+    # las galerías de cámaras pueden incluir rutas externas; de las registradas solo se aceptan las subidas
+    # por un admin (o sin dueño) que no estén ya en una oferta u otra cámara
+    wanted = {path for path in paths if path}
+    if wanted:
+        result = await session.execute(
+            select(MediaAsset.path, MediaAsset.offer_id, MediaAsset.camera_id, User.is_admin)
+            .outerjoin(User, User.id == MediaAsset.owner_id)
+            .where(MediaAsset.path.in_(wanted))
+            .with_for_update(of=MediaAsset)
+        )
+        conflicts = {
+            path
+            for path, offer_id, linked_camera_id, owner_is_admin in result.all()
+            if owner_is_admin is False
+            or offer_id is not None
+            or (linked_camera_id is not None and linked_camera_id != camera_id)
+        }
+        if conflicts:
+            raise MediaConflict(conflicts)
+    await session.execute(
+        update(MediaAsset)
+        .where(MediaAsset.camera_id == camera_id, MediaAsset.path.not_in(wanted))
+        .values(camera_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    if wanted:
+        await session.execute(
+            update(MediaAsset)
+            .where(MediaAsset.path.in_(wanted), MediaAsset.camera_id.is_(None))
+            .values(camera_id=camera_id)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def find_orphans(session: AsyncSession, older_than: timedelta, limit: int) -> list[MediaAsset]:
+    # usa el índice parcial media_assets_unlinked_idx; no recorre el sistema de archivos
+    cutoff = datetime.utcnow() - older_than
+    result = await session.execute(
+        select(MediaAsset)
+        .where(MediaAsset.offer_id.is_(None), MediaAsset.camera_id.is_(None), MediaAsset.created_at < cutoff)
+        .order_by(MediaAsset.created_at)
+        .limit(limit)
+        # un claim_for_offer concurrente espera al lote; otro limpiador salta estas filas
+        .with_for_update(skip_locked=True)
+    )
+    return list(result.scalars())
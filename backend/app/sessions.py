@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import time
+import uuid
+from functools import lru_cache
+
+import redis.asyncio as redis
+
+from .config import get_settings
+from .utils.security import generate_session_token
+
+settings = get_settings()
+
+# sess:{sha256(token)} -> hash {u: user_id.hex, c: epoch de creación}
+# user_sessions:{user_id.hex} -> set de hashes de token activos del usuario
+SESSION_PREFIX = 'sess:'
+USER_SESSIONS_PREFIX = 'user_sessions:'
+
+# lee la sesión y renueva su TTL junto con el del índice del usuario en un solo viaje
+RESOLVE_SCRIPT = """
+local user_hex = redis.call('HGET', KEYS[1], 'u')
+if not user_hex then
+    return false
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', ARGV[2] .. user_hex, ARGV[1])
+return user_hex
+"""
+
+# SMEMBERS + DEL atómicos: una sesión creada en medio no puede sobrevivir a la revocación
+REVOKE_ALL_SCRIPT = """
+local members = redis.call('SMEMBERS', KEYS[1])
+local removed = 0
+for _, member in ipairs(members) do
+    removed = removed + redis.call('DEL', ARGV[1] .. member)
+end
+redis.call('DEL', KEYS[1])
+return removed
+"""
+
+
+def hash_token(token: str) -> str:
+    # el token tiene 256 bits aleatorios: un sha256 sin sal basta para no guardarlo en claro
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _session_key(token_hash: str) -> str:
+    return f'{SESSION_PREFIX}{token_hash}'
+
+
+def _user_sessions_key(user_id: uuid.UUID) -> str:
+    return f'{USER_SESSIONS_PREFIX}{user_id.hex}'
+
+
+@lru_cache(maxsize=8)
+def _script(store: redis.Redis, source: str):
+    return store.register_script(source)
+
+
+async def _prune_user_sessions(store: redis.Redis, user_id: uuid.UUID) -> None:
+    index_key = _user_sessions_key(user_id)
+    members = list(await store.smembers(index_key))
+    if not members:
+        return
+    async with store.pipeline(transaction=False) as pipe:
+        for member in members:
+            pipe.exists(_session_key(member))
+        alive = await pipe.execute()
+    expired = [member for member, exists in zip(members, alive) if not exists]
+    if expired:
+        await store.srem(index_key, *expired)
+
+
+async def create_session(store: redis.Redis, user_id: uuid.UUID) -> str:
+    token = generate_session_token()
+    token_hash = hash_token(token)
+    # el índice vive tanto como su sesión más reciente; se depura aquí para no acumular sesiones vencidas
+    await _prune_user_sessions(store, user_id)
+    async with store.pipeline(transaction=True) as pipe:
+        pipe.hset(_session_key(token_hash), mapping={'u': user_id.hex, 'c': int(time.time())})
+        pipe.expire(_session_key(token_hash), settings.session_ttl_seconds)
+        pipe.sadd(_user_sessions_key(user_id), token_hash)
+        pipe.expire(_user_sessions_key(user_id), settings.session_ttl_seconds)
+        await pipe.execute()
+    return token
+
+
+async def resolve_session(store: redis.Redis, token: str) -> uuid.UUID | None:
+    user_hex = await _script(store, RESOLVE_SCRIPT)(
+        keys=[_session_key(hash_token(token))],
+        args=[settings.session_ttl_seconds, USER_SESSIONS_PREFIX],
+    )
+    if not user_hex:
+        return None
+    try:
+        return uuid.UUID(hex=user_hex)
+    except ValueError:  # pragma: no cover - guard rail
+        return None
+
+
+async def revoke_session(store: redis.Redis, token: str) -> None:
+    token_hash = hash_token(token)
+    key = _session_key(token_hash)
+    user_hex = await store.hget(key, 'u')
+    async with store.pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        if user_hex:
+            pipe.srem(f'{USER_SESSIONS_PREFIX}{user_hex}', token_hash)
+        await pipe.execute()
+
+
+async def revoke_user_sessions(store: redis.Redis, user_id: uuid.UUID) -> int:
+    removed = await _script(store, REVOKE_ALL_SCRIPT)(keys=[_user_sessions_key(user_id)], args=[SESSION_PREFIX])
+    return int(removed)
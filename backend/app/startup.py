@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+
 from sqlalchemy import select
 
 from .config import get_settings
 from .database import async_session_factory
+from .locks import STARTUP_LOCK_KEY, advisory_lock
+from .migrations import verify_schema
 from .models import User
-from .utils.security import get_password_hash
+from .utils.security import get_password_hash, verify_and_update_password
 
 settings = get_settings()
 
@@ -14,18 +18,35 @@ async def ensure_admin_user() -> None:
     async with async_session_factory() as session:
         result = await session.execute(select(User).where(User.email == settings.admin_email.lower()))
         admin = result.scalar_one_or_none()
-        hashed_password = get_password_hash(settings.admin_password)
+        preferred_currency = settings.default_currency.upper()
         if admin:
-            admin.hashed_password = hashed_password
+            # bcrypt es caro: solo se vuelve a hashear si la contraseña configurada cambió o el hash es obsoleto
+            valid, upgraded_hash = await asyncio.to_thread(
+                verify_and_update_password, settings.admin_password, admin.hashed_password
+            )
+            if valid and upgraded_hash is None and admin.is_admin and admin.preferred_currency == preferred_currency:
+                return
+            if not valid:
+                upgraded_hash = await asyncio.to_thread(get_password_hash, settings.admin_password)
+            if upgraded_hash:
+                admin.hashed_password = upgraded_hash
             admin.is_admin = True
-            admin.preferred_currency = settings.default_currency.upper()
+            admin.preferred_currency = preferred_currency
         else:
             admin = User(
                 name='Administrador GeneralStore',
                 email=settings.admin_email.lower(),
-                hashed_password=hashed_password,
+                hashed_password=await asyncio.to_thread(get_password_hash, settings.admin_password),
                 is_admin=True,
-                preferred_currency=settings.default_currency.upper(),
+                preferred_currency=preferred_currency,
             )
             session.add(admin)
         await session.commit()
+
+
+async def run_startup_tasks() -> None:
+    # las migraciones se aplican con `python -m app.migrations upgrade`; aquí solo se verifica la versión
+    await verify_schema()
+    # serializa el aprovisionamiento del admin entre procesos y réplicas
+    async with advisory_lock(STARTUP_LOCK_KEY):
+        await ensure_admin_user()
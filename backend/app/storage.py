@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from .config import get_settings
+
+settings = get_settings()
+# Alinea con la raíz del backend para que los archivos queden en /app/media
+BASE_DIR = Path(__file__).resolve().parent.parent
+MEDIA_ROOT = (BASE_DIR / settings.media_root).resolve()
+CAMERA_UPLOAD_DIR = MEDIA_ROOT / 'cameras'
+# subidas en curso; mismo sistema de archivos que CAMERA_UPLOAD_DIR para que el rename final sea atómico
+INCOMING_DIR = MEDIA_ROOT / '.incoming'
+
+
+def ensure_media_dirs() -> None:
+    # se llama en el lifespan, no al importar: importar la app no toca el sistema de archivos
+    CAMERA_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    INCOMING_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from .locks import try_advisory_lock
+from .redis_client import cache_store
+
+logger = logging.getLogger(__name__)
+
+# cada worker revisa con esta frecuencia si ya toca correr; la marca compartida decide quién lo hace
+PERIODIC_POLL_SECONDS = 30
+
+
+def _last_run_key(name: str) -> str:
+    return f'periodic:{name}:last_run'
+
+
+async def _claim_interval(name: str, interval_seconds: float) -> bool:
+    # SET NX EX: la primera réplica que llega en el intervalo toma la corrida; las demás la saltan
+    claimed = await cache_store().set(
+        _last_run_key(name), datetime.utcnow().isoformat(), nx=True, ex=max(1, int(interval_seconds))
+    )
+    return bool(claimed)
+
+
+async def mark_ran(name: str, interval_seconds: float) -> None:
+    # una corrida manual reinicia el intervalo para que la periódica no la repita enseguida
+    await cache_store().set(_last_run_key(name), datetime.utcnow().isoformat(), ex=max(1, int(interval_seconds)))
+
+
+async def run_periodic(name: str, interval_seconds: float, job: Callable[[], Awaitable[object]], lock_key: int) -> None:
+    # todos los workers programan el trabajo; el advisory lock evita corridas solapadas y la marca en Redis
+    # garantiza una sola corrida por intervalo en todo el despliegue
+    while True:
+        try:
+            async with try_advisory_lock(lock_key) as acquired:
+                if acquired and await _claim_interval(name, interval_seconds):
+                    await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001 - un fallo no debe detener las siguientes ejecuciones
+            logger.exception('Falló la tarea periódica %s', name)
+        await asyncio.sleep(min(interval_seconds, PERIODIC_POLL_SECONDS))
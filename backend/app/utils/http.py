@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from fastapi import HTTPException, Response, status
+
+
+def set_last_modified(response: Response, *timestamps: datetime | None) -> None:
+    values = [value for value in timestamps if value is not None]
+    if not values:
+        return
+    latest = max(value if value.tzinfo else value.replace(tzinfo=timezone.utc) for value in values)
+    response.headers['Last-Modified'] = format_datetime(latest.astimezone(timezone.utc), usegmt=True)
+
+
+def set_version_etag(response: Response, version: int) -> None:
+    # débil: CompressionMiddleware puede recodificar el cuerpo y un ETag fuerte prometería los mismos bytes
+    response.headers['ETag'] = f'W/"{version}"'
+
+
+def expected_version(if_match: str | None) -> int | None:
+    # If-Match ausente o "*" no condiciona la escritura; cualquier otro valor debe ser una versión conocida
+    if if_match is None or if_match.strip() == '*':
+        return None
+    tag = if_match.split(',')[0].strip().removeprefix('W/').strip('"')
+    try:
+        return int(tag)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail='If-Match no corresponde a una versión válida',
+        ) from exc
+
+
+def version_conflict(resource: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail=f'{resource} fue modificada por alguien más; recarga e intenta de nuevo',
+    )
@@ -1,13 +1,97 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from types import ModuleType
 
 
 CENT = Decimal('0.01')
+# tasas de cambio como enteros de punto fijo con 8 decimales; toda la aritmética queda en enteros
+RATE_SCALE = 10**8
+_HALF_SCALE = RATE_SCALE // 2
+
+# Regla única de redondeo para catálogo, carrito y ofertas: al centavo más cercano, empates lejos de cero.
+ROUNDING = ROUND_HALF_UP
+
+
+@lru_cache(maxsize=1)
+def _numpy() -> ModuleType | None:
+    # dependencia opcional y pesada: se importa en la primera conversión por lotes, no con la app
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
+
+
+def _to_decimal(amount: Decimal | int | str | float) -> Decimal:
+    if isinstance(amount, Decimal):
+        return amount
+    if isinstance(amount, float):
+        # str() da la representación decimal más corta del float, no su expansión binaria
+        return Decimal(str(amount))
+    return Decimal(amount)
+
+
+def price_to_cents(amount: Decimal | int | str | float) -> int:
+    return int(_to_decimal(amount).quantize(CENT, rounding=ROUNDING).scaleb(2))
+
+
+def cents_to_float(value: int) -> float:
+    # división correctamente redondeada: el float más cercano al valor decimal exacto
+    return value / 100
+
+
+def rate_to_fixed(rate: Decimal | int | str | float) -> int:
+    return int((_to_decimal(rate) * RATE_SCALE).quantize(Decimal(1), rounding=ROUNDING))
+
+
+def _convert_fixed(cents: int, fixed_rate: int) -> int:
+    magnitude = (abs(cents) * fixed_rate + _HALF_SCALE) // RATE_SCALE
+    return magnitude if cents >= 0 else -magnitude
+
+
+def convert_cents_batch(
+    cents: Sequence[int],
+    rates: Sequence[Decimal | int | str | float] | Decimal | int | str | float,
+) -> list[int]:
+    if isinstance(rates, (Decimal, int, str, float)):
+        fixed = [rate_to_fixed(rates)] * len(cents)
+    else:
+        if len(rates) != len(cents):
+            raise ValueError('cents y rates deben tener la misma longitud')
+        fixed = [rate_to_fixed(rate) for rate in rates]
+
+    np = _numpy()
+    if np is None:
+        return [_convert_fixed(value, rate) for value, rate in zip(cents, fixed)]
+
+    values = np.asarray(cents, dtype=np.int64)
+    magnitude = np.abs(values)
+    # se separa la tasa en parte entera y fraccionaria para que ningún producto desborde int64
+    whole, fraction = np.divmod(np.asarray(fixed, dtype=np.int64), RATE_SCALE)
+    converted = magnitude * whole + (magnitude * fraction + _HALF_SCALE) // RATE_SCALE
+    return (np.sign(values) * converted).tolist()
+
+
+@dataclass(frozen=True, slots=True)
+class Money:
+    cents: int
+    currency: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'currency', self.currency.upper())
 
-def price_to_cents(amount: float | Decimal) -> int:
-    decimal_value = Decimal(str(amount)).quantize(CENT, rounding=ROUND_HALF_UP)
-    return int(decimal_value * 100)
+    @classmethod
+    def from_amount(cls, amount: Decimal | int | str | float, currency: str) -> Money:
+        return cls(price_to_cents(amount), currency)
 
+    def as_float(self) -> float:
+        return cents_to_float(self.cents)
 
-def cents_to_price(value: int) -> float:
-    return float(Decimal(value) / 100)
+    def __add__(self, other: Money) -> Money:
+        if self.currency != other.currency:
+            raise ValueError(f'No se pueden combinar {self.currency} y {other.currency}')
+        return Money(self.cents + other.cents, self.currency)
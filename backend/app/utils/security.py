@@ -1,17 +1,33 @@
+from __future__ import annotations
+
 import secrets
 import uuid
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
 
-from passlib.context import CryptContext
+@lru_cache(maxsize=1)
+def pwd_context() -> CryptContext:
+    # passlib y el backend de bcrypt se cargan con el primer hash, no al importar la app
+    from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+    return CryptContext(schemes=['bcrypt'], deprecated='auto')
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    # devuelve un hash nuevo solo si el guardado usa parámetros obsoletos
+    return pwd_context().verify_and_update(plain_password, hashed_password)
 
 
 def generate_session_token() -> str:
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .config import get_settings
+from .database import async_session_factory, engine
+from .deps import user_statement
+from .readiness import readiness
+from .routers.cart import cart_items_statement
+from .routers.offers import my_offers_statement
+from .services.catalog import catalog_statement, load_catalog
+from .services.exchange import DEFAULT_RATE_SYMBOLS, ExchangeService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _hot_statements():
+    # las sentencias reales de las rutas más llamadas; asyncpg cachea el statement preparado por conexión
+    placeholder = uuid.UUID(int=0)
+    return [
+        user_statement(placeholder),
+        catalog_statement(),
+        cart_items_statement(placeholder),
+        my_offers_statement(placeholder),
+    ]
+
+
+async def _warm_catalog() -> None:
+    async with async_session_factory() as session:
+        await load_catalog(session)
+
+
+def _rate_symbol_sets(base_currency: str) -> list[list[str]]:
+    # mismos conjuntos que piden /currency/rates (símbolos por omisión) y el total convertido del carrito
+    supported = [code for code in settings.supported_currency_list if code != base_currency]
+    defaults = [code for code in DEFAULT_RATE_SYMBOLS if code != base_currency]
+    symbol_sets = [supported]
+    if set(defaults) != set(supported):
+        symbol_sets.append(defaults)
+    return symbol_sets
+
+
+async def _warm_rates(base_currency: str) -> None:
+    service = ExchangeService()
+    for symbols in _rate_symbol_sets(base_currency):
+        await service.fetch_rates(base_currency, symbols)
+
+
+async def _prepare_statements(conn: AsyncConnection) -> None:
+    for statement in _hot_statements():
+        # cursor del lado del servidor: prepara la sentencia sin traer todas las filas (p. ej. el catálogo)
+        result = await conn.stream(statement)
+        await result.fetchmany(1)
+        await result.close()
+
+
+async def _warm_pool_statements() -> None:
+    # se toman todas las conexiones del pool a la vez para que cada una prepare sus sentencias
+    async with AsyncExitStack() as stack:
+        connections = [await stack.enter_async_context(engine.connect()) for _ in range(settings.db_pool_size)]
+        await asyncio.gather(*(_prepare_statements(conn) for conn in connections))
+
+
+def _warmup_tasks() -> list[tuple[str, Callable[[], Awaitable[None]]]]:
+    tasks: list[tuple[str, Callable[[], Awaitable[None]]]] = [
+        ('catalog', _warm_catalog),
+        ('statements', _warm_pool_statements),
+    ]
+    tasks.extend(
+        (f'exchange:{code}', lambda code=code: _warm_rates(code)) for code in settings.supported_currency_list
+    )
+    return tasks
+
+
+async def warm_up() -> None:
+    tasks = _warmup_tasks()
+    readiness.start_warmup(len(tasks))
+    semaphore = asyncio.Semaphore(settings.warmup_concurrency)
+    started = time.perf_counter()
+
+    async def run(name: str, task: Callable[[], Awaitable[None]]) -> None:
+        async with semaphore:
+            try:
+                await asyncio.wait_for(task(), timeout=settings.warmup_timeout_seconds)
+            except Exception:  # noqa: BLE001 - un caché frío no debe impedir servir tráfico
+                logger.warning('Falló el calentamiento de %s', name, exc_info=True)
+                readiness.warmup_failed.append(name)
+            else:
+                readiness.warmup_completed += 1
+
+    await asyncio.gather(*(run(name, task) for name, task in tasks))
+    readiness.finish_warmup()
+    logger.info(
+        'Calentamiento terminado en %.2fs (%d/%d, fallidos: %s)',
+        time.perf_counter() - started,
+        readiness.warmup_completed,
+        readiness.warmup_total,
+        readiness.warmup_failed or '-',
+    )
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from . import consumers  # noqa: F401 - registra los handlers del outbox
+from .config import get_settings
+from .database import async_session_factory, engine
+from .models import OutboxEvent
+from .outbox import HANDLERS, wait_for_events
+from .redis_client import close_redis
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _backoff(attempts: int) -> timedelta:
+    seconds = min(settings.outbox_max_backoff_seconds, settings.outbox_base_backoff_seconds * 2 ** (attempts - 1))
+    return timedelta(seconds=seconds)
+
+
+async def process_batch(batch_size: int | None = None) -> int:
+    limit = batch_size or settings.outbox_batch_size
+    async with async_session_factory() as session:
+        # SKIP LOCKED permite varios workers (en proceso o dedicados) sin procesar dos veces un evento
+        result = await session.execute(
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.processed_at.is_(None),
+                OutboxEvent.failed_at.is_(None),
+                OutboxEvent.available_at <= func.now(),
+            )
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        events = result.scalars().all()
+        for event in events:
+            now = datetime.utcnow()
+            consumer = HANDLERS.get(event.topic)
+            try:
+                if consumer is None:
+                    raise LookupError(f'Sin handler para {event.topic}')
+                await consumer(event.payload)
+            except Exception as exc:  # noqa: BLE001 - el error queda registrado en el evento
+                event.attempts += 1
+                event.last_error = repr(exc)[:2000]
+                if event.attempts >= settings.outbox_max_attempts:
+                    event.failed_at = now
+                    logger.error('Evento %s (%s) descartado tras %d intentos', event.id, event.topic, event.attempts)
+                else:
+                    event.available_at = now + _backoff(event.attempts)
+            else:
+                event.processed_at = now
+        await session.commit()
+    return len(events)
+
+
+async def run_worker() -> None:
+    while True:
+        try:
+            processed = await process_batch()
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001 - p. ej. la base no está disponible; se reintenta en el siguiente ciclo
+            logger.exception('Falló el drenado del outbox')
+            processed = 0
+        if processed >= settings.outbox_batch_size:
+            continue
+        await wait_for_events(settings.outbox_poll_seconds)
+
+
+async def _main() -> None:
+    try:
+        await run_worker()
+    finally:
+        await close_redis()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
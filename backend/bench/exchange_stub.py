@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from fastapi import FastAPI, Query
+
+# Tasas fijas para que los benchmarks no dependan de la red ni de un proveedor externo
+RATES_FROM_USD = {
+    'USD': 1.0,
+    'MXN': 17.05,
+    'EUR': 0.92,
+    'GBP': 0.79,
+    'JPY': 149.6,
+    'CAD': 1.36,
+}
+
+app = FastAPI(title='Exchange API stub')
+
+
+@app.get('/latest')
+async def latest(base: str = Query(default='USD'), symbols: str | None = None):
+    base_rate = RATES_FROM_USD.get(base.upper(), 1.0)
+    requested = [code.strip().upper() for code in symbols.split(',')] if symbols else list(RATES_FROM_USD)
+    rates = {
+        code: round(RATES_FROM_USD[code] / base_rate, 6) for code in requested if code in RATES_FROM_USD
+    }
+    return {'base': base.upper(), 'rates': rates}
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from .seed import DEFAULT_MANIFEST
+
+# PNG 1x1 válido; el contenido real no importa, solo el tamaño y el número de archivos
+PNG_PIXEL = bytes.fromhex(
+    '89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c4'
+    '890000000d49444154789c6360000002000005000157a3a5a10000000049454e44ae426082'
+)
+UPLOAD_FILE_BYTES = 200_000
+UPLOAD_FILES_PER_REQUEST = 3
+
+
+@dataclass
+class Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    statuses: dict[str, dict[int, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+
+    async def request(
+        self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+        self.statuses[name][response.status_code] += 1
+        if response.status_code >= 500:
+            self.errors[name] += 1
+        return response
+
+
+@dataclass
+class Context:
+    manifest: dict
+    rng: random.Random
+
+    def token(self) -> str:
+        return self.rng.choice(self.manifest['session_tokens'])
+
+    def camera_id(self) -> str:
+        return self.rng.choice(self.manifest['camera_ids'])
+
+    def auth(self, token: str) -> dict[str, str]:
+        return {'X-Session-Token': token}
+
+
+async def browse_catalog(client: httpx.AsyncClient, recorder: Recorder, ctx: Context) -> None:
+    await recorder.request(client, 'GET /cameras', 'GET', '/cameras')
+    for _ in range(3):
+        await recorder.request(client, 'GET /cameras/{id}', 'GET', f'/cameras/{ctx.camera_id()}')
+    await recorder.request(client, 'GET /currency/rates', 'GET', '/currency/rates', params={'base': 'USD'})
+
+
+async def login_burst(client: httpx.AsyncClient, recorder: Recorder, ctx: Context) -> None:
+    email = ctx.rng.choice(ctx.manifest['login_emails'])
+    response = await recorder.request(
+        client,
+        'POST /auth/login',
+        'POST',
+        '/auth/login',
+        json={'email': email, 'password': ctx.manifest['password']},
+    )
+    if response is not None and response.status_code == 200:
+        token = response.json()['token']
+        await recorder.request(client, 'GET /auth/me', 'GET', '/auth/me', headers=ctx.auth(token))
+
+
+async def cart_contention(client: httpx.AsyncClient, recorder: Recorder, ctx: Context) -> None:
+    headers = ctx.auth(ctx.token())
+    # mezcla de cámaras "calientes" (compartidas) y frías para simular competencia real por inventario
+    pool = ctx.manifest['hot_camera_ids'] if ctx.rng.random() < 0.5 else ctx.manifest['cart_camera_ids']
+    for camera_id in ctx.rng.sample(pool, k=min(2, len(pool))):
+        await recorder.request(client, 'POST /cart', 'POST', '/cart', json={'camera_id': camera_id}, headers=headers)
+    await recorder.request(client, 'GET /cart', 'GET', '/cart', headers=headers)
+    if ctx.rng.random() < 0.3:
+        await recorder.request(client, 'POST /cart/checkout', 'POST', '/cart/checkout', headers=headers)
+
+
+async def multi_upload(client: httpx.AsyncClient, recorder: Recorder, ctx: Context) -> None:
+    payload = PNG_PIXEL + bytes(UPLOAD_FILE_BYTES - len(PNG_PIXEL))
+    files = [('files', (f'bench-{index}.png', payload, 'image/png')) for index in range(UPLOAD_FILES_PER_REQUEST)]
+    await recorder.request(
+        client, 'POST /media/upload', 'POST', '/media/upload', files=files, headers=ctx.auth(ctx.token())
+    )
+
+
+SCENARIOS = {
+    'browse': browse_catalog,
+    'login': login_burst,
+    'cart': cart_contention,
+    'upload': multi_upload,
+}
+
+WORKLOADS = {
+    'mixed': {'browse': 70, 'login': 10, 'cart': 15, 'upload': 5},
+    'catalog': {'browse': 100},
+    'login': {'login': 100},
+    'cart': {'cart': 100},
+    'upload': {'upload': 100},
+}
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(percentile / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput_rps': round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+            'p50': round(_percentile(ordered, 50) * 1000, 3),
+            'p90': round(_percentile(ordered, 90) * 1000, 3),
+            'p95': round(_percentile(ordered, 95) * 1000, 3),
+            'p99': round(_percentile(ordered, 99) * 1000, 3),
+            'max': round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _virtual_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    ctx: Context,
+    weights: dict[str, int],
+    deadline: float,
+) -> None:
+    names = list(weights)
+    counts = [weights[name] for name in names]
+    while time.perf_counter() < deadline:
+        scenario = SCENARIOS[ctx.rng.choices(names, weights=counts)[0]]
+        await scenario(client, recorder, ctx)
+
+
+async def run(
+    base_url: str,
+    workload: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    manifest: dict,
+    rng_seed: int,
+) -> dict:
+    weights = WORKLOADS[workload]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        if warmup > 0:
+            warm_recorder = Recorder()
+            warm_deadline = time.perf_counter() + warmup
+            await asyncio.gather(
+                *(
+                    _virtual_user(
+                        client,
+                        warm_recorder,
+                        Context(manifest, random.Random(f'warmup-{rng_seed}-{i}')),
+                        weights,
+                        warm_deadline,
+                    )
+                    for i in range(concurrency)
+                )
+            )
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *(
+                _virtual_user(client, recorder, Context(manifest, random.Random(rng_seed + i)), weights, deadline)
+                for i in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    endpoints = {
+        name: {
+            **_summarize(recorder.latencies.get(name, []), recorder.errors.get(name, 0), elapsed),
+            'status_codes': {str(code): count for code, count in sorted(recorder.statuses[name].items())},
+        }
+        for name in sorted(set(recorder.latencies) | set(recorder.errors))
+    }
+    return {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'base_url': base_url,
+        'workload': workload,
+        'weights': weights,
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 3),
+        'dataset': manifest.get('counts', {}),
+        'overall': _summarize(all_latencies, sum(recorder.errors.values()), elapsed),
+        'endpoints': endpoints,
+    }
+
+
+def compare(baseline: dict, candidate: dict) -> dict:
+    def delta(old: float, new: float) -> float | None:
+        return round((new - old) / old * 100, 2) if old else None
+
+    rows = {}
+    for name in sorted(set(baseline['endpoints']) | set(candidate['endpoints'])):
+        old = baseline['endpoints'].get(name)
+        new = candidate['endpoints'].get(name)
+        if not old or not new:
+            rows[name] = {'baseline': old is not None, 'candidate': new is not None}
+            continue
+        rows[name] = {
+            'throughput_rps_pct': delta(old['throughput_rps'], new['throughput_rps']),
+            'p50_pct': delta(old['latency_ms']['p50'], new['latency_ms']['p50']),
+            'p99_pct': delta(old['latency_ms']['p99'], new['latency_ms']['p99']),
+        }
+    return {
+        'baseline_commit': baseline.get('commit'),
+        'candidate_commit': candidate.get('commit'),
+        'overall': {
+            'throughput_rps_pct': delta(baseline['overall']['throughput_rps'], candidate['overall']['throughput_rps']),
+            'p50_pct': delta(baseline['overall']['latency_ms']['p50'], candidate['overall']['latency_ms']['p50']),
+            'p99_pct': delta(baseline['overall']['latency_ms']['p99'], candidate['overall']['latency_ms']['p99']),
+        },
+        'endpoints': rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Ejecuta cargas de trabajo contra la API y reporta latencias.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run')
+    run_parser.add_argument('--base-url', default='http://localhost:8000')
+    run_parser.add_argument('--workload', choices=sorted(WORKLOADS), default='mixed')
+    run_parser.add_argument('--concurrency', type=int, default=32)
+    run_parser.add_argument('--duration', type=float, default=60)
+    run_parser.add_argument('--warmup', type=float, default=10)
+    run_parser.add_argument('--seed', type=int, default=7)
+    run_parser.add_argument('--manifest', type=Path, default=DEFAULT_MANIFEST)
+    run_parser.add_argument('--output', type=Path)
+
+    compare_parser = subparsers.add_parser('compare')
+    compare_parser.add_argument('baseline', type=Path)
+    compare_parser.add_argument('candidate', type=Path)
+
+    args = parser.parse_args()
+    if args.command == 'compare':
+        result = compare(json.loads(args.baseline.read_text()), json.loads(args.candidate.read_text()))
+    else:
+        result = asyncio.run(
+            run(
+                base_url=args.base_url,
+                workload=args.workload,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+                manifest=json.loads(args.manifest.read_text()),
+                rng_seed=args.seed,
+            )
+        )
+    output = json.dumps(result, indent=2)
+    if getattr(args, 'output', None):
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
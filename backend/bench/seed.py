@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, insert, text
+
+from app.database import engine
+from app.migrations import upgrade as upgrade_schema
+from app.models import Camera, CameraStatus, Offer, OfferStatus, User
+from app.redis_client import close_redis, session_store
+from app.sessions import create_session
+from app.utils.security import get_password_hash
+
+BENCH_EMAIL_DOMAIN = 'bench.local'
+BENCH_PASSWORD = 'bench-password'
+DEFAULT_MANIFEST = Path(__file__).resolve().parent / 'manifest.json'
+
+BRANDS = ['Canon', 'Nikon', 'Pentax', 'Olympus', 'Minolta', 'Leica', 'Yashica', 'Fujifilm', 'Ricoh', 'Konica']
+CONDITIONS = ['Mint', 'Excelente', 'Muy buena', 'Buena', 'Para refacciones']
+CURRENCIES = ['USD', 'USD', 'USD', 'MXN', 'EUR']
+OFFER_STATUSES = [OfferStatus.pending, OfferStatus.accepted, OfferStatus.declined, OfferStatus.countered]
+
+
+def _batches(total: int, size: int):
+    start = 0
+    while start < total:
+        yield start, min(size, total - start)
+        start += size
+
+
+def _seeded_uuid(rng: random.Random) -> uuid.UUID:
+    # ids derivados del RNG sembrado: la misma --seed produce el mismo conjunto de datos
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _camera_rows(rng: random.Random, offset: int, count: int, now: datetime) -> list[dict]:
+    rows = []
+    for index in range(offset, offset + count):
+        brand = rng.choice(BRANDS)
+        created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        sold = rng.random() < 0.3
+        rows.append(
+            {
+                'id': _seeded_uuid(rng),
+                'title': f'{brand} bench #{index}',
+                'brand': brand,
+                'description': 'Cámara generada para pruebas de carga. ' * rng.randint(1, 6),
+                'price_cents': rng.randint(2_000, 250_000),
+                'currency': rng.choice(CURRENCIES),
+                'condition': rng.choice(CONDITIONS),
+                'status': CameraStatus.sold if sold else CameraStatus.available,
+                'image_path': f'/uploads/cameras/bench-{index % 500}.jpg',
+                'image_gallery': [f'/uploads/cameras/bench-{(index + step) % 500}.jpg' for step in range(3)],
+                'created_at': created_at,
+                'updated_at': created_at,
+                'sold_at': created_at + timedelta(days=rng.randint(1, 90)) if sold else None,
+            }
+        )
+    return rows
+
+
+def _user_rows(rng: random.Random, offset: int, count: int, hashed_password: str, now: datetime) -> list[dict]:
+    return [
+        {
+            'id': _seeded_uuid(rng),
+            'name': f'Bench User {index}',
+            'email': f'user{index}@{BENCH_EMAIL_DOMAIN}',
+            'hashed_password': hashed_password,
+            'is_admin': False,
+            'preferred_currency': 'USD',
+            'created_at': now,
+        }
+        for index in range(offset, offset + count)
+    ]
+
+
+def _offer_rows(rng: random.Random, user_ids: list[uuid.UUID], count: int, now: datetime) -> list[dict]:
+    rows = []
+    for _ in range(count):
+        status = rng.choice(OFFER_STATUSES)
+        asking = rng.randint(1_000, 150_000)
+        created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        rows.append(
+            {
+                'id': _seeded_uuid(rng),
+                'user_id': rng.choice(user_ids),
+                'camera_title': f'{rng.choice(BRANDS)} oferta',
+                'brand': rng.choice(BRANDS),
+                'condition': rng.choice(CONDITIONS),
+                'asking_price_cents': asking,
+                'preferred_currency': rng.choice(CURRENCIES),
+                'notes': 'Oferta generada para pruebas de carga',
+                'image_gallery': [f'/uploads/cameras/bench-{rng.randint(0, 499)}.jpg' for _ in range(3)],
+                'status': status,
+                'counter_offer_cents': int(asking * 0.85) if status == OfferStatus.countered else None,
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+        )
+    return rows
+
+
+async def reset() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text('TRUNCATE cart_items, media_assets, offers, cameras, outbox_events'))
+        await conn.execute(delete(User).where(User.email.like(f'%@{BENCH_EMAIL_DOMAIN}')))
+
+
+async def seed(
+    cameras: int,
+    users: int,
+    offers: int,
+    sessions: int,
+    batch_size: int,
+    manifest_path: Path,
+    rng_seed: int,
+) -> dict:
+    rng = random.Random(rng_seed)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+
+    await upgrade_schema()
+    await reset()
+
+    # bcrypt es deliberadamente lento: un solo hash compartido por todos los usuarios de prueba
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    user_ids: list[uuid.UUID] = []
+    camera_ids: list[uuid.UUID] = []
+
+    for offset, count in _batches(users, batch_size):
+        rows = _user_rows(rng, offset, count, hashed_password, now)
+        async with engine.begin() as conn:
+            await conn.execute(insert(User), rows)
+        user_ids.extend(row['id'] for row in rows)
+
+    available_ids: list[uuid.UUID] = []
+    for offset, count in _batches(cameras, batch_size):
+        rows = _camera_rows(rng, offset, count, now)
+        async with engine.begin() as conn:
+            await conn.execute(insert(Camera), rows)
+        camera_ids.extend(row['id'] for row in rows)
+        available_ids.extend(row['id'] for row in rows if row['status'] == CameraStatus.available)
+
+    for _, count in _batches(offers, batch_size):
+        rows = _offer_rows(rng, user_ids, count, now)
+        async with engine.begin() as conn:
+            await conn.execute(insert(Offer), rows)
+
+    async with engine.begin() as conn:
+        await conn.execute(text('ANALYZE users, cameras, offers, cart_items'))
+
+    store = session_store()
+    tokens = [await create_session(store, user_id) for user_id in user_ids[:sessions]]
+
+    rng.shuffle(available_ids)
+    manifest = {
+        'generated_at': now.isoformat(),
+        'counts': {'cameras': cameras, 'users': users, 'offers': offers, 'sessions': len(tokens)},
+        'password': BENCH_PASSWORD,
+        'login_emails': [f'user{index}@{BENCH_EMAIL_DOMAIN}' for index in range(min(users, 2_000))],
+        'session_tokens': tokens,
+        'camera_ids': [str(camera_id) for camera_id in rng.sample(camera_ids, min(len(camera_ids), 5_000))],
+        # pocas cámaras compartidas por muchos usuarios para provocar contención en carrito/checkout
+        'hot_camera_ids': [str(camera_id) for camera_id in available_ids[:50]],
+        'cart_camera_ids': [str(camera_id) for camera_id in available_ids[50:20_050]],
+        'seed_seconds': round(time.perf_counter() - started, 2),
+    }
+    manifest_path.write_text(json.dumps(manifest))
+    return manifest
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        manifest = await seed(
+            cameras=args.cameras,
+            users=args.users,
+            offers=args.offers,
+            sessions=args.sessions,
+            batch_size=args.batch_size,
+            manifest_path=args.manifest,
+            rng_seed=args.seed,
+        )
+    finally:
+        await close_redis()
+        await engine.dispose()
+    print(json.dumps({'counts': manifest['counts'], 'seed_seconds': manifest['seed_seconds']}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Carga datos de prueba en Postgres y Redis para los benchmarks.')
+    parser.add_argument('--cameras', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=50_000)
+    parser.add_argument('--offers', type=int, default=1_000_000)
+    parser.add_argument('--sessions', type=int, default=1_000)
+    parser.add_argument('--batch-size', type=int, default=5_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--manifest', type=Path, default=DEFAULT_MANIFEST)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.models import Camera, CameraStatus
+from app.schemas import CameraBase, CameraListResponse
+from app.serializers import CAMERA_SERIALIZER, encode_items
+
+from .seed import BRANDS, CONDITIONS
+
+
+def _camera_rows(count: int, rng: random.Random) -> list[tuple]:
+    now = datetime.now(timezone.utc)
+    rows = []
+    for index in range(count):
+        created_at = now - timedelta(minutes=rng.randint(0, 500_000))
+        values = {
+            'id': uuid.uuid4(),
+            'title': f'Cámara #{index}',
+            'brand': rng.choice(BRANDS),
+            'description': 'Descripción de prueba ' * 4,
+            'condition': rng.choice(CONDITIONS),
+            'price_cents': rng.randint(2_000, 250_000),
+            'currency': 'USD',
+            'status': CameraStatus.available,
+            'image_path': f'/uploads/cameras/{index}.jpg',
+            'image_gallery': [f'/uploads/cameras/{index}-{step}.jpg' for step in range(3)],
+            'created_at': created_at,
+            'updated_at': created_at,
+            'sold_at': None,
+            'version': 1,
+        }
+        rows.append(tuple(values[name] for name in CAMERA_SERIALIZER.fields))
+    return rows
+
+
+def orm_pydantic_path(cameras: list[Camera]) -> bytes:
+    # ruta previa de list_cameras: model_validate + model_dump + json.dumps para caché + reconstrucción
+    items = []
+    for camera in cameras:
+        data = CameraBase.model_validate(camera).model_dump(mode='json')
+        data['price'] = camera.price_cents / 100
+        items.append(data)
+    json.dumps(items, default=str)
+    return CameraListResponse(items=[CameraBase(**item) for item in items]).model_dump_json().encode()
+
+
+def row_serializer_path(rows: list[tuple]) -> bytes:
+    return encode_items(CAMERA_SERIALIZER.to_dicts(rows))
+
+
+def _measure(func, argument, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(argument)
+        timings.append(time.perf_counter() - started)
+    return {
+        'best_ms': round(min(timings) * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compara la serialización ORM+pydantic contra RowSerializer.')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = _camera_rows(args.rows, random.Random(3))
+    names = list(CAMERA_SERIALIZER.fields)
+    # entidades transitorias: no incluye el costo de hidratación/identity map, así que subestima la mejora real
+    cameras = [Camera(**dict(zip(names, row))) for row in rows]
+
+    baseline = _measure(orm_pydantic_path, cameras, args.repeat)
+    candidate = _measure(row_serializer_path, rows, args.repeat)
+    print(
+        json.dumps(
+            {
+                'rows': args.rows,
+                'repeat': args.repeat,
+                'orm_pydantic': baseline,
+                'row_serializer': candidate,
+                'speedup_median': round(baseline['median_ms'] / candidate['median_ms'], 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
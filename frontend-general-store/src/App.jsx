@@ -68,9 +68,12 @@ const formatMoney = (value, currency) => {
   }
 }
 
-const apiFetch = async (path, { method = 'GET', body, token } = {}) => {
+const versionHeaders = (version) => (version ? { 'If-Match': `"${version}"` } : undefined)
+
+const apiFetch = async (path, { method = 'GET', body, token, headers: extraHeaders } = {}) => {
   const headers = {
     Accept: 'application/json',
+    ...extraHeaders,
   }
   let requestBody
 
@@ -144,6 +147,7 @@ function App() {
   const [cameraFiles, setCameraFiles] = useState([])
   const [primaryImageIndex, setPrimaryImageIndex] = useState(0)
   const [editingCameraId, setEditingCameraId] = useState(null)
+  const [editingCameraVersion, setEditingCameraVersion] = useState(null)
   const [brandSelect, setBrandSelect] = useState('')
 
   const logoPlaceholderText = `${COMPANY_NAME}: coloca tu logo en frontend-general-store/public/branding/logo.png`
@@ -486,7 +490,12 @@ function App() {
         currency: 'GTQ',
       }
       if (editingCameraId) {
-        await apiFetch(`/cameras/${editingCameraId}`, { method: 'PATCH', body: payload, token: sessionToken })
+        await apiFetch(`/cameras/${editingCameraId}`, {
+          method: 'PATCH',
+          body: payload,
+          token: sessionToken,
+          headers: versionHeaders(editingCameraVersion),
+        })
         showStatus('success', 'Cámara actualizada.')
       } else {
         await apiFetch('/cameras', { method: 'POST', body: payload, token: sessionToken })
@@ -498,6 +507,7 @@ function App() {
       setCameraFiles([])
       setPrimaryImageIndex(0)
       setEditingCameraId(null)
+      setEditingCameraVersion(null)
       setShowCameraForm(false)
       fetchCameras()
     } catch (error) {
@@ -530,6 +540,7 @@ function App() {
 
   const startEditingCamera = (camera) => {
     setEditingCameraId(camera.id)
+    setEditingCameraVersion(camera.version ?? null)
     setCameraForm({
       title: camera.title,
       brand: camera.brand,
@@ -551,7 +562,13 @@ function App() {
 
   const handleCameraStatus = async (cameraId, updates) => {
     try {
-      await apiFetch(`/cameras/${cameraId}`, { method: 'PATCH', body: updates, token: sessionToken })
+      const camera = cameras.find((item) => item.id === cameraId)
+      await apiFetch(`/cameras/${cameraId}`, {
+        method: 'PATCH',
+        body: updates,
+        token: sessionToken,
+        headers: versionHeaders(camera?.version),
+      })
       fetchCameras()
       showStatus('success', 'Actualizaste el estado de la cámara.')
     } catch (error) {
@@ -561,10 +578,12 @@ function App() {
 
   const handleOfferDecision = async (offerId, action, counter_amount) => {
     try {
+      const offer = [...adminOffers, ...myOffers].find((item) => item.id === offerId)
       await apiFetch(`/offers/${offerId}/decision`, {
         method: 'POST',
         body: { action, counter_amount },
         token: sessionToken,
+        headers: versionHeaders(offer?.version),
       })
       fetchAdminOffers()
       fetchMyOffers()